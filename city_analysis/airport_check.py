@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import re
@@ -9,12 +10,36 @@ from typing import Dict, Iterable, List, Optional, Tuple
 
 import requests
 from openai import OpenAI
+
+try:  # Optional fast path for parsing LLM JSON replies
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 from tqdm import tqdm
 import random
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from .http_utils import SESSION
+
+# One lazily built OpenAI client shared by the airport and hospital checks:
+# constructing a client spins up an httpx pool (TCP+TLS), so reusing it
+# amortizes that across every enrichment call in a run.
+_CLIENT: Optional[OpenAI] = None
+
+
+def _client() -> OpenAI:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        atexit.register(_CLIENT.close)
+    return _CLIENT
+
+
+_FENCED_JSON_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+_BRACE_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 
 @dataclass
 class AirportResult:
@@ -38,18 +63,18 @@ class DriveResult:
 
 
 def _extract_first_json(text: str) -> Optional[Dict]:
-    if not text:
+    if not text or "{" not in text:
         return None
-    fenced = re.findall(r"```json\s*(\{[\s\S]*?\})\s*```", text)
+    fenced = _FENCED_JSON_RE.findall(text)
     candidates: List[str] = []
     if fenced:
         candidates.extend(fenced)
-    braces = re.findall(r"\{[\s\S]*\}", text)
+    braces = _BRACE_JSON_RE.findall(text)
     if braces:
         candidates.append(braces[0])
     for cand in candidates:
         try:
-            return json.loads(cand)
+            return orjson.loads(cand) if orjson is not None else json.loads(cand)
         except Exception:
             continue
     return None
@@ -211,10 +236,12 @@ def _osrm_route(
     airport_lon: float,
     base_url: str = "https://router.project-osrm.org",
     request_timeout: Optional[float] = None,
+    session: Optional[requests.Session] = None,
 ) -> DriveResult:
     try:
         url = f"{base_url.rstrip('/')}/route/v1/driving/{city_lon:.6f},{city_lat:.6f};{airport_lon:.6f},{airport_lat:.6f}?overview=false&annotations=duration,distance&alternatives=false"
-        resp = requests.get(url) if request_timeout is None else requests.get(url, timeout=request_timeout)
+        http = session or SESSION
+        resp = http.get(url) if request_timeout is None else http.get(url, timeout=request_timeout)
         if resp.status_code != 200:
             return DriveResult(
                 driving_km_to_airport=None,
@@ -282,7 +309,7 @@ def enrich_records_with_nearest_airport(
       - driving_km_to_airport, driving_time_minutes_to_airport
       - driving_confidence_pct, driving_reasoning, driving_error
     """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = _client()
 
     enriched: List[Dict] = []
 
@@ -414,7 +441,7 @@ def _download_ourairports_csv(cache_path: Path) -> Path:
     headers = {"User-Agent": "city-analysis/1.0"}
     try:
         # Try with default cert verification (requests+certifi)
-        resp = requests.get(url, timeout=60, headers=headers)
+        resp = SESSION.get(url, timeout=60, headers=headers)
         resp.raise_for_status()
         cache_path.write_bytes(resp.content)
         return cache_path
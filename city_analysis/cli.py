@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import List
 import logging
@@ -12,7 +15,7 @@ from dotenv import load_dotenv
 from .config import ALPINE_COUNTRIES, DEFAULT_MIN_POPULATION, DEFAULT_REQUIRE_OSM_POPULATION, load_region_settings, load_region_settings_from_yaml
 from .geometry import default_alps_polygon, load_perimeter, polygon_bounds
 from .perimeter_loader import resolve_region_perimeter
-from .geonames import fetch_geonames_cities
+from .geonames import fetch_geonames_cities_list
 from .overpass import fetch_overpass_bbox_tiled
 from .normalize import filter_within_perimeter, dedupe_places, enforce_min_population
 from .io_utils import write_csv, write_geojson, read_csv_records, write_details_json, read_details_json
@@ -20,12 +23,34 @@ from .analysis import top_n_by_population, summarize
 from .country_filters import filter_excluded_countries, fill_missing_country
 from .distance import add_distance_to_perimeter_km
 from .elevation import enrich_places_with_elevation
-from .map_utils import save_map, save_country_map
+from .map_utils import prepare_map_records, save_map, save_country_map
 from .hospital_check import enrich_records_with_hospital_presence, enrich_records_with_hospital_presence_osm
 from .airport_check import enrich_records_with_nearest_airport, enrich_records_with_nearest_airport_offline
 from .peak_check import enrich_records_with_nearby_higher_peaks
 
 
+def _float_env(key: str, default: float) -> float:
+    """Float env-var lookup that avoids formatting/parsing a default string."""
+    return float(os.environ[key]) if key in os.environ else default
+
+
+def _int_env(key: str, default: int) -> int:
+    """Int env-var lookup that avoids formatting/parsing a default string."""
+    return int(os.environ[key]) if key in os.environ else default
+
+
+@functools.lru_cache(maxsize=16)
+def _ensure_out_dir(base: str, slug: str) -> Path:
+    """Create (once) and return the per-region output directory.
+
+    Cached so repeated invocations in the same process don't re-issue the
+    stat+mkdir syscalls for the same (base, slug) pair.
+    """
+    out_dir = Path(base) / slug
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return out_dir
+
+
 def parse_args() -> argparse.Namespace:
     # Load .env before reading environment defaults
     load_dotenv()
@@ -52,11 +77,11 @@ def parse_args() -> argparse.Namespace:
     # Hospitals always enriched via OSM by default; suppress CLI toggles
     parser.add_argument("--check-hospitals", action="store_true", help=argparse.SUPPRESS)
     parser.add_argument("--hospital-mode", type=str, choices=["osm", "openai", "hybrid"], default=os.getenv("HOSPITAL_MODE", "osm"), help=argparse.SUPPRESS)
-    parser.add_argument("--hospital-radius-km", type=float, default=float(os.getenv("HOSPITAL_RADIUS_KM", "3.0")), help="Radius in km around city centroid to consider OSM hospitals (default 3.0)")
-    parser.add_argument("--hospital-tile-size", type=float, default=float(os.getenv("HOSPITAL_TILE_SIZE_DEG", "1.0")), help="Overpass tile size in degrees for hospital fetch (default 1.0)")
+    parser.add_argument("--hospital-radius-km", type=float, default=_float_env("HOSPITAL_RADIUS_KM", 3.0), help="Radius in km around city centroid to consider OSM hospitals (default 3.0)")
+    parser.add_argument("--hospital-tile-size", type=float, default=_float_env("HOSPITAL_TILE_SIZE_DEG", 1.0), help="Overpass tile size in degrees for hospital fetch (default 1.0)")
     parser.add_argument("--hospital-no-openai-fallback", action="store_true", help="In hybrid mode, disable OpenAI fallback (OSM only)")
     parser.add_argument("--openai-model", type=str, default=os.getenv("OPENAI_MODEL", "gpt-5"), help="OpenAI model to use for hospital/airport checks when enabled")
-    parser.add_argument("--openai-timeout", type=float, default=float(os.getenv("OPENAI_TIMEOUT", "60")), help="Per-request timeout (seconds) for OpenAI when enabled")
+    parser.add_argument("--openai-timeout", type=float, default=_float_env("OPENAI_TIMEOUT", 60.0), help="Per-request timeout (seconds) for OpenAI when enabled")
 
     # Map generation options
     parser.add_argument("--make-map", action="store_true", help="Generate interactive HTML map alongside CSV/GeoJSON")
@@ -69,15 +94,15 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--check-airports", action="store_true", help=argparse.SUPPRESS)
     parser.add_argument("--airports-use-openai", action="store_true", help=argparse.SUPPRESS)
     parser.add_argument("--airports-dataset", type=str, default=os.getenv("AIRPORTS_DATASET", None), help="Path to OurAirports CSV; if omitted, auto-download and cache")
-    parser.add_argument("--airports-topk", type=int, default=int(os.getenv("AIRPORTS_TOPK", "3")), help="Top-K nearest airports to consider for OSRM refinement (offline mode)")
-    parser.add_argument("--airports-max-radius-km", type=float, default=float(os.getenv("AIRPORTS_MAX_RADIUS_KM", "400")), help="Max crow-flies radius to attempt OSRM driving (offline mode)")
+    parser.add_argument("--airports-topk", type=int, default=_int_env("AIRPORTS_TOPK", 3), help="Top-K nearest airports to consider for OSRM refinement (offline mode)")
+    parser.add_argument("--airports-max-radius-km", type=float, default=_float_env("AIRPORTS_MAX_RADIUS_KM", 400.0), help="Max crow-flies radius to attempt OSRM driving (offline mode)")
     parser.add_argument("--osrm-base-url", type=str, default=os.getenv("OSRM_BASE_URL", "https://router.project-osrm.org"), help="Base URL for OSRM routing service")
     parser.add_argument("--airports-limit", type=int, default=None, help="Limit number of records to process for airport enrichment (useful for testing)")
     parser.add_argument("--airports-resume-missing", action="store_true", help="Only process rows missing airport name or with airport_error; keep existing successes")
-    parser.add_argument("--airports-max-retries", type=int, default=int(os.getenv("AIRPORTS_MAX_RETRIES", "2")), help="Max retries for OpenAI airport lookup")
-    parser.add_argument("--airports-initial-backoff", type=float, default=float(os.getenv("AIRPORTS_INITIAL_BACKOFF", "2.0")), help="Initial backoff seconds before retry")
-    parser.add_argument("--airports-backoff-multiplier", type=float, default=float(os.getenv("AIRPORTS_BACKOFF_MULTIPLIER", "2.0")), help="Backoff multiplier between retries")
-    parser.add_argument("--airports-jitter", type=float, default=float(os.getenv("AIRPORTS_JITTER", "0.5")), help="Jitter seconds added/subtracted to backoff")
+    parser.add_argument("--airports-max-retries", type=int, default=_int_env("AIRPORTS_MAX_RETRIES", 2), help="Max retries for OpenAI airport lookup")
+    parser.add_argument("--airports-initial-backoff", type=float, default=_float_env("AIRPORTS_INITIAL_BACKOFF", 2.0), help="Initial backoff seconds before retry")
+    parser.add_argument("--airports-backoff-multiplier", type=float, default=_float_env("AIRPORTS_BACKOFF_MULTIPLIER", 2.0), help="Backoff multiplier between retries")
+    parser.add_argument("--airports-jitter", type=float, default=_float_env("AIRPORTS_JITTER", 0.5), help="Jitter seconds added/subtracted to backoff")
 
     # Second map style (country-colored, population-sized)
     parser.add_argument("--make-country-map", action="store_true", help="Generate country-colored, population-sized map")
@@ -87,9 +112,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--from-csv", type=str, default=None, help="Path to an existing CSV of cities to build a map from")
     # Peaks enrichment (optional)
     parser.add_argument("--check-peaks", action="store_true", help="Compute nearby higher peaks (natural=peak) and add columns")
-    parser.add_argument("--peaks-radius-km", type=float, default=float(os.getenv("PEAKS_RADIUS_KM", "30.0")), help="Radius in km around city centroid to search for peaks (default 30.0)")
-    parser.add_argument("--peaks-min-height-diff-m", type=float, default=float(os.getenv("PEAKS_MIN_HEIGHT_DIFF_M", "1200.0")), help="Only count peaks at least this many meters above the city elevation (default 1200.0)")
-    parser.add_argument("--peaks-tile-size", type=float, default=float(os.getenv("PEAKS_TILE_SIZE_DEG", "1.0")), help="Overpass tile size in degrees for peak fetch (default 1.0)")
+    parser.add_argument("--peaks-radius-km", type=float, default=_float_env("PEAKS_RADIUS_KM", 30.0), help="Radius in km around city centroid to search for peaks (default 30.0)")
+    parser.add_argument("--peaks-min-height-diff-m", type=float, default=_float_env("PEAKS_MIN_HEIGHT_DIFF_M", 1200.0), help="Only count peaks at least this many meters above the city elevation (default 1200.0)")
+    parser.add_argument("--peaks-tile-size", type=float, default=_float_env("PEAKS_TILE_SIZE_DEG", 1.0), help="Overpass tile size in degrees for peak fetch (default 1.0)")
     # Pipeline staging / checkpointing
     parser.add_argument("--stage", type=str, choices=[
         "fetch", "filter", "dedupe", "enrich_elevation", "enrich_hospitals", "enrich_peaks", "enrich_airports", "maps", "all"
@@ -105,6 +130,38 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _merge_enrichment_columns(base: List[dict], enriched: List[dict]) -> None:
+    """Merge columns added by an enrichment pass back into the canonical records.
+
+    Enrichers preserve record order, so rows are matched positionally when the
+    lengths agree; otherwise fall back to a (lat, lon) key. Only new or changed
+    columns are copied, so concurrent enrichers touching disjoint columns do
+    not clobber each other.
+    """
+    def _key(r: dict):
+        try:
+            return (round(float(r.get("latitude")), 6), round(float(r.get("longitude")), 6))
+        except Exception:
+            return None
+
+    if len(base) == len(enriched):
+        pairs = zip(base, enriched)
+    else:
+        index = {}
+        for r in base:
+            k = _key(r)
+            if k is not None and k not in index:
+                index[k] = r
+        pairs = ((index.get(_key(er)), er) for er in enriched)
+
+    for target, er in pairs:
+        if target is None:
+            continue
+        for col, val in er.items():
+            if col not in target or target[col] != val:
+                target[col] = val
+
+
 def main() -> None:
     args = parse_args()
     
@@ -200,8 +257,7 @@ def main() -> None:
     # Fast path: Build map(s) directly from an existing CSV
     if args.from_csv:
         records = read_csv_records(args.from_csv)
-        out_dir = Path(args.out_dir) / settings.slug
-        out_dir.mkdir(parents=True, exist_ok=True)
+        out_dir = _ensure_out_dir(args.out_dir, settings.slug)
 
         # Compute perimeter and bbox for optional enrichments that need it
         if args.perimeter:
@@ -214,16 +270,16 @@ def main() -> None:
         if args.check_hospitals:
             if args.hospital_mode == "openai":
                 print("Checking hospital presence via OpenAI (explicitly enabled)", file=sys.stderr)
-                records = enrich_records_with_hospital_presence(
+                records, hospitals_changed = enrich_records_with_hospital_presence(
                     records,
                     model=args.openai_model,
                     request_timeout=args.openai_timeout,
                 )
             else:
                 print("Checking hospital presence via OSM (default)", file=sys.stderr)
-                records = enrich_records_with_hospital_presence_osm(
+                records, hospitals_changed = enrich_records_with_hospital_presence_osm(
                     records,
-                    perimeter_bbox=bbox if 'bbox' in locals() else None,
+                    perimeter_bbox=bbox,
                     radius_km=args.hospital_radius_km,
                     tile_size_deg=args.hospital_tile_size,
                     sleep_between_tiles=0.5,
@@ -232,16 +288,19 @@ def main() -> None:
                     request_timeout=args.openai_timeout,
                     osrm_base_url=args.osrm_base_url,
                 )
-            csv_path = out_dir / f"{settings.slug}_cities.csv"
-            write_csv(csv_path, records, delimiter=",")
-            write_details_json(out_dir / f"{settings.slug}_cities_details.json", records)
-            print(f"Wrote CSV with hospital columns to {csv_path}")
+            if hospitals_changed:
+                csv_path = out_dir / f"{settings.slug}_cities.csv"
+                write_csv(csv_path, records, delimiter=",")
+                write_details_json(out_dir / f"{settings.slug}_cities_details.json", records)
+                print(f"Wrote CSV with hospital columns to {csv_path}")
+            else:
+                print("Hospital columns unchanged; skipping CSV rewrite", file=sys.stderr)
         # Optionally enrich CSV with peaks before building maps (defaults: 30km, 1200m)
         if getattr(args, "check_peaks", False):
             print("Checking nearby higher peaks via OSM...", file=sys.stderr)
             records = enrich_records_with_nearby_higher_peaks(
                 records,
-                perimeter_bbox=bbox if 'bbox' in locals() else None,
+                perimeter_bbox=bbox,
                 radius_km=args.peaks_radius_km,
                 min_height_diff_m=args.peaks_min_height_diff_m,
                 tile_size_deg=args.peaks_tile_size,
@@ -288,21 +347,22 @@ def main() -> None:
             write_csv(csv_path, records, delimiter=",")
             write_details_json(out_dir / f"{settings.slug}_cities_details.json", records)
             print(f"Wrote CSV with airport and driving columns to {csv_path}")
+        prepared_map_records = prepare_map_records(records)
         if args.make_map:
             map_path = Path(args.map_file) if args.map_file else (out_dir / f"{settings.slug}_cities_map.html")
-            save_map(records, map_path, tiles=(args.map_tiles or settings.map_tiles))
+            save_map(records, map_path, tiles=(args.map_tiles or settings.map_tiles), prepared=prepared_map_records)
             print(f"Wrote interactive map to {map_path}")
         if args.make_country_map:
             country_map_path = Path(args.country_map_file) if args.country_map_file else (out_dir / f"{settings.slug}_cities_country_map.html")
-            save_country_map(records, country_map_path, tiles=(args.map_tiles or settings.map_tiles))
+            save_country_map(records, country_map_path, tiles=(args.map_tiles or settings.map_tiles), prepared=prepared_map_records)
             print(f"Wrote country-colored map to {country_map_path}")
         # If neither flag was given, default to generating both maps from CSV for convenience
         if not args.make_map and not args.make_country_map:
             map_path = out_dir / f"{settings.slug}_cities_map.html"
-            save_map(records, map_path, tiles=(args.map_tiles or settings.map_tiles))
+            save_map(records, map_path, tiles=(args.map_tiles or settings.map_tiles), prepared=prepared_map_records)
             print(f"Wrote interactive map to {map_path}")
             country_map_path = out_dir / f"{settings.slug}_cities_country_map.html"
-            save_country_map(records, country_map_path, tiles=(args.map_tiles or settings.map_tiles))
+            save_country_map(records, country_map_path, tiles=(args.map_tiles or settings.map_tiles), prepared=prepared_map_records)
             print(f"Wrote country-colored map to {country_map_path}")
         return
 
@@ -325,7 +385,7 @@ def main() -> None:
     geonames_records: List[dict] = []
     if args.geonames_username:
         try:
-            geonames_records = fetch_geonames_cities(
+            geonames_records = fetch_geonames_cities_list(
                 countries=(args.countries or settings.countries),
                 min_population=(args.min_population or settings.min_population),
                 username=args.geonames_username,
@@ -335,8 +395,7 @@ def main() -> None:
             sys.exit(1)
 
     # Stage: fetch
-    out_dir = Path(args.out_dir) / settings.slug
-    out_dir.mkdir(parents=True, exist_ok=True)
+    out_dir = _ensure_out_dir(args.out_dir, settings.slug)
     stage_fetch_json = out_dir / "stage_fetch_combined.json"
     stage_filtered_json = out_dir / "stage_filtered.json"
     stage_deduped_json = out_dir / "stage_deduped.json"
@@ -441,8 +500,67 @@ def main() -> None:
     # Add distance to region perimeter
     enriched = add_distance_to_perimeter_km(deduped, perimeter=perimeter, region_slug=settings.slug)
 
-    # Stage: enrich_elevation
-    if args.stage in ("enrich_elevation", "all"):
+    # Stage: enrich_elevation / enrich_hospitals / enrich_airports
+    # In a full pipeline run the three enrichments hit independent services
+    # (elevation APIs, Overpass, OSRM) and fill disjoint columns, so run them
+    # concurrently on record copies and merge the columns back. Each service
+    # still sees at most one in-flight client, so Overpass etiquette holds.
+    if args.stage == "all":
+        def _run_elevation(records_copy: List[dict]) -> List[dict]:
+            if args.skip_elevation:
+                print("Skipping elevation enrichment (using only OSM/GeoNames data)", file=sys.stderr)
+                return records_copy
+            print("Enriching places with elevation data...", file=sys.stderr)
+            return enrich_places_with_elevation(
+                records_copy,
+                google_api_key=args.google_api_key,
+                batch_size=args.elevation_batch_size
+            )
+
+        def _run_hospitals(records_copy: List[dict]) -> List[dict]:
+            print("Checking hospital presence via OSM (default)", file=sys.stderr)
+            hospital_records, _ = enrich_records_with_hospital_presence_osm(
+                records_copy,
+                perimeter_bbox=bbox,
+                radius_km=args.hospital_radius_km,
+                tile_size_deg=args.hospital_tile_size,
+                sleep_between_tiles=0.5,
+                fallback_to_openai=False,
+                model=args.openai_model,
+                request_timeout=args.openai_timeout,
+                osrm_base_url=args.osrm_base_url,
+                cache_dir=str(Path(args.cache_dir)),
+                region_slug=settings.slug,
+                resume=args.resume,
+            )
+            return hospital_records
+
+        def _run_airports(records_copy: List[dict]) -> List[dict]:
+            print("Finding nearest international airports and driving metrics...", file=sys.stderr)
+            print("Using offline dataset mode (default; no OpenAI)", file=sys.stderr)
+            return enrich_records_with_nearest_airport_offline(
+                records_copy,
+                dataset_csv=args.airports_dataset,
+                osrm_base_url=args.osrm_base_url,
+                topk=args.airports_topk,
+                max_radius_km=args.airports_max_radius_km or 1000.0,
+                limit=args.airports_limit,
+                resume_missing_only=args.airports_resume_missing,
+            )
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(_run_elevation, [dict(r) for r in enriched]),
+                executor.submit(_run_hospitals, [dict(r) for r in enriched]),
+                executor.submit(_run_airports, [dict(r) for r in enriched]),
+            ]
+            for future in futures:
+                _merge_enrichment_columns(enriched, future.result())
+
+        # Checkpoint the merged result so stage-based resumption still works
+        write_geojson(stage_enriched_elev_json, enriched)
+        write_geojson(stage_enriched_hosp_json, enriched)
+    elif args.stage == "enrich_elevation":
         if not args.skip_elevation:
             print("Enriching places with elevation data...", file=sys.stderr)
             enriched = enrich_places_with_elevation(
@@ -453,8 +571,7 @@ def main() -> None:
         else:
             print("Skipping elevation enrichment (using only OSM/GeoNames data)", file=sys.stderr)
         write_geojson(stage_enriched_elev_json, enriched)
-        if args.stage == "enrich_elevation":
-            return
+        return
     else:
         try:
             import json as _json
@@ -474,10 +591,10 @@ def main() -> None:
 
     # Optional: Hospital presence check
     # Always enrich with hospital presence via OSM by default
-    # Stage: enrich_hospitals
-    if args.stage in ("enrich_hospitals", "all"):
+    # Stage: enrich_hospitals (the "all" path ran this concurrently above)
+    if args.stage == "enrich_hospitals":
         print("Checking hospital presence via OSM (default)", file=sys.stderr)
-        enriched = enrich_records_with_hospital_presence_osm(
+        enriched, _ = enrich_records_with_hospital_presence_osm(
             enriched,
             perimeter_bbox=bbox,
             radius_km=args.hospital_radius_km,
@@ -492,9 +609,8 @@ def main() -> None:
             resume=args.resume,
         )
         write_geojson(stage_enriched_hosp_json, enriched)
-        if args.stage == "enrich_hospitals":
-            return
-    else:
+        return
+    elif args.stage != "all":
         try:
             import json as _json
             data = _json.loads(stage_enriched_hosp_json.read_text(encoding="utf-8"))
@@ -518,9 +634,9 @@ def main() -> None:
         enriched = enrich_records_with_nearby_higher_peaks(
             enriched,
             perimeter_bbox=bbox,
-            radius_km=float(os.getenv("PEAKS_RADIUS_KM", str(getattr(args, "peaks_radius_km", 30.0)))),
-            min_height_diff_m=float(os.getenv("PEAKS_MIN_HEIGHT_DIFF_M", str(getattr(args, "peaks_min_height_diff_m", 1200.0)))),
-            tile_size_deg=float(os.getenv("PEAKS_TILE_SIZE_DEG", str(getattr(args, "peaks_tile_size", 1.0)))),
+            radius_km=_float_env("PEAKS_RADIUS_KM", getattr(args, "peaks_radius_km", 30.0)),
+            min_height_diff_m=_float_env("PEAKS_MIN_HEIGHT_DIFF_M", getattr(args, "peaks_min_height_diff_m", 1200.0)),
+            tile_size_deg=_float_env("PEAKS_TILE_SIZE_DEG", getattr(args, "peaks_tile_size", 1.0)),
             sleep_between_tiles=0.5,
             cache_dir=str(Path(args.cache_dir)),
             region_slug=settings.slug,
@@ -529,16 +645,19 @@ def main() -> None:
         # No dedicated stage file yet; keep in main flow
         if args.stage == "enrich_peaks":
             # Ensure output directory
-            out_dir = Path(args.out_dir) / settings.slug
-            out_dir.mkdir(parents=True, exist_ok=True)
+            out_dir = _ensure_out_dir(args.out_dir, settings.slug)
             write_csv(out_dir / f"{settings.slug}_cities.csv", enriched)
             write_geojson(out_dir / f"{settings.slug}_cities.geojson", enriched)
             return
 
     # Optional: Nearest international airport + driving time/distance
     # Always enrich with nearest airport via offline dataset by default
-    # Stage: enrich_airports
-    if args.stage in ("enrich_airports", "all"):
+    # Stage: enrich_airports (the "all" path ran this concurrently above; the
+    # checkpoint is written here so it includes the peaks columns, matching
+    # the sequential ordering)
+    if args.stage == "all":
+        write_geojson(stage_enriched_air_json, enriched)
+    elif args.stage == "enrich_airports":
         print("Finding nearest international airports and driving metrics...", file=sys.stderr)
         print("Using offline dataset mode (default; no OpenAI)", file=sys.stderr)
         enriched = enrich_records_with_nearest_airport_offline(
@@ -551,8 +670,7 @@ def main() -> None:
             resume_missing_only=args.airports_resume_missing,
         )
         write_geojson(stage_enriched_air_json, enriched)
-        if args.stage == "enrich_airports":
-            return
+        return
     else:
         try:
             import json as _json
@@ -571,24 +689,40 @@ def main() -> None:
             sys.exit(2)
 
     # Ensure output directory
-    out_dir = Path(args.out_dir) / settings.slug
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    # Write outputs
-    write_csv(out_dir / f"{settings.slug}_cities.csv", enriched, delimiter=",")
-    write_details_json(out_dir / f"{settings.slug}_cities_details.json", enriched)
-    write_geojson(out_dir / f"{settings.slug}_cities.geojson", enriched)
-
-    # Optionally write interactive maps
+    out_dir = _ensure_out_dir(args.out_dir, settings.slug)
+
+    # Write outputs; the three writers are independent and I/O-bound, so
+    # overlap them instead of serializing the same records three times in a row
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        write_futures = [
+            executor.submit(write_csv, out_dir / f"{settings.slug}_cities.csv", enriched, delimiter=","),
+            executor.submit(write_details_json, out_dir / f"{settings.slug}_cities_details.json", enriched),
+            executor.submit(write_geojson, out_dir / f"{settings.slug}_cities.geojson", enriched),
+        ]
+        for future in write_futures:
+            future.result()
+
+    # Optionally write interactive maps; the two renders are independent too
     # Stage: maps
-    if args.stage in ("maps", "all") and args.make_map:
-        map_path = Path(args.map_file) if args.map_file else (out_dir / f"{settings.slug}_cities_map.html")
-        save_map(enriched, map_path, tiles=(args.map_tiles or settings.map_tiles))
-        print(f"Wrote interactive map to {map_path}")
-    if args.stage in ("maps", "all") and args.make_country_map:
-        country_map_path = Path(args.country_map_file) if args.country_map_file else (out_dir / f"{settings.slug}_cities_country_map.html")
-        save_country_map(enriched, country_map_path, tiles=(args.map_tiles or settings.map_tiles))
-        print(f"Wrote country-colored map to {country_map_path}")
+    if args.stage in ("maps", "all") and (args.make_map or args.make_country_map):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            map_jobs = []
+            prepared_map_records = prepare_map_records(enriched) if (args.make_map and args.make_country_map) else None
+            if args.make_map:
+                map_path = Path(args.map_file) if args.map_file else (out_dir / f"{settings.slug}_cities_map.html")
+                map_jobs.append((
+                    executor.submit(save_map, enriched, map_path, tiles=(args.map_tiles or settings.map_tiles), prepared=prepared_map_records),
+                    f"Wrote interactive map to {map_path}",
+                ))
+            if args.make_country_map:
+                country_map_path = Path(args.country_map_file) if args.country_map_file else (out_dir / f"{settings.slug}_cities_country_map.html")
+                map_jobs.append((
+                    executor.submit(save_country_map, enriched, country_map_path, tiles=(args.map_tiles or settings.map_tiles), prepared=prepared_map_records),
+                    f"Wrote country-colored map to {country_map_path}",
+                ))
+            for future, message in map_jobs:
+                future.result()
+                print(message)
 
     # Console summary
     stats = summarize(enriched)
@@ -597,16 +731,23 @@ def main() -> None:
         print(f"  {k}: {v}")
 
     print(f"\nTop {args.top} by population:")
+    core_fields = itemgetter("name", "latitude", "longitude", "source")
     for r in top_n_by_population(enriched, n=args.top):
+        name, latitude, longitude, source = core_fields(r)
+        country = r.get("country", "")
+        population = r.get("population", 0)
+        elevation = r.get("elevation")
+        dist_km = r.get("distance_km_to_perimeter")
         elevation_info = ""
-        if r.get('elevation') is not None:
+        if elevation is not None:
             source_info = ""
-            if r.get('elevation_source') and r.get('elevation_source') not in ['osm', 'geonames']:
-                confidence = r.get('elevation_confidence', 0.0)
-                source_info = f" [{r['elevation_source']}:{confidence:.1f}]"
-            elevation_info = f", elev {r['elevation']}m{source_info}"
-        print(f"  {r['name']} ({r.get('country','')}) — pop {r.get('population', 0):,} @ ({r['latitude']:.4f},{r['longitude']:.4f}) [{r['source']}]" +
-              f"{elevation_info}, {r.get('distance_km_to_perimeter')} km to {settings.name}")
+            elev_src = r.get("elevation_source")
+            if elev_src and elev_src not in ("osm", "geonames"):
+                confidence = r.get("elevation_confidence", 0.0)
+                source_info = f" [{elev_src}:{confidence:.1f}]"
+            elevation_info = f", elev {elevation}m{source_info}"
+        print(f"  {name} ({country}) — pop {population:,} @ ({latitude:.4f},{longitude:.4f}) [{source}]" +
+              f"{elevation_info}, {dist_km} km to {settings.name}")
 
 
 if __name__ == "__main__":
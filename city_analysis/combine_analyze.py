@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import pandas as pd
 import numpy as np
@@ -17,41 +19,43 @@ def find_region_slug(csv_path: Path) -> str:
              outputs/sierra_nevada/sierra_nevada_cities.csv -> 'sierra_nevada'
              outputs/sierra_nevada/sierra_nevada/sierra_nevada_cities.csv -> 'sierra_nevada'
     """
-    parts = list(csv_path.parts)
-    try:
-        outputs_idx = parts.index("outputs")
-    except ValueError:
-        # Fallback: use parent directory name
-        return csv_path.parent.name
-    if outputs_idx + 1 < len(parts):
-        return parts[outputs_idx + 1]
+    parts = csv_path.parts
+    for idx, part in enumerate(parts):
+        if part == "outputs":
+            if idx + 1 < len(parts):
+                return parts[idx + 1]
+            break
+    # Fallback: use parent directory name
     return csv_path.parent.name
 
 
-def load_and_standardize_csv(csv_path: Path, region_slug: Optional[str] = None) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
-
-    # Add region column
-    if region_slug is None:
-        region_slug = find_region_slug(csv_path)
-    df["region"] = region_slug
-
-    # Coerce common numeric fields
-    numeric_cols = [
-        "population",
-        "elevation",
-        "elevation_confidence",
-        "distance_km_to_perimeter",
-        "driving_km_to_airport",
-        "driving_km_to_hospital",
-        "driving_time_minutes_to_airport",
-        "driving_time_minutes_to_hospital",
-        "nearest_hospital_km",
-        "peaks_higher1200_within30km_count",
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+# Common numeric fields; parsed directly as float64 on the fast read path
+NUMERIC_COLS = [
+    "population",
+    "elevation",
+    "elevation_confidence",
+    "distance_km_to_perimeter",
+    "driving_km_to_airport",
+    "driving_km_to_hospital",
+    "driving_time_minutes_to_airport",
+    "driving_time_minutes_to_hospital",
+    "nearest_hospital_km",
+    "peaks_higher1200_within30km_count",
+]
+
+
+def _read_standardized(csv_path: Path) -> pd.DataFrame:
+    # Prefer the multithreaded Arrow CSV reader, which parses numeric columns
+    # directly; fall back to the default engine (plus explicit coercion) on
+    # files it cannot handle.
+    try:
+        df = pd.read_csv(csv_path, engine="pyarrow")
+        coerce_cols = [c for c in NUMERIC_COLS if c in df.columns and df[c].dtype == object]
+    except Exception:
+        df = pd.read_csv(csv_path)
+        coerce_cols = [c for c in NUMERIC_COLS if c in df.columns]
+    for col in coerce_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # Normalize region-distance column to a generic name for convenience
     region_distance_cols = [c for c in df.columns if c.startswith("distance_km_to_") and c not in ("distance_km_to_perimeter",)]
@@ -66,9 +70,54 @@ def load_and_standardize_csv(csv_path: Path, region_slug: Optional[str] = None)
     return df
 
 
-def discover_csvs(outputs_dir: Path) -> List[Path]:
+def _cached_read(csv_path: Path) -> pd.DataFrame:
+    """Read a standardized frame, using a parquet sidecar to skip re-parsing.
+
+    The sidecar (<name>.cache.parquet + <name>.cache.json) is keyed on the
+    CSV's (mtime, size); when it matches, deserializing the parquet is much
+    cheaper than re-parsing the CSV. Any cache error silently falls back to
+    the plain CSV path. The region column is assigned by the caller so the
+    cache stays valid if a file is moved between region folders.
+    """
+    stat = csv_path.stat()
+    sidecar = csv_path.with_suffix(".cache.parquet")
+    meta_path = csv_path.with_suffix(".cache.json")
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("mtime") == stat.st_mtime and meta.get("size") == stat.st_size:
+            return pd.read_parquet(sidecar)
+    except Exception:
+        pass
+    df = _read_standardized(csv_path)
+    try:
+        df.to_parquet(sidecar, index=False)
+        meta_path.write_text(json.dumps({"mtime": stat.st_mtime, "size": stat.st_size}), encoding="utf-8")
+    except Exception:
+        pass
+    return df
+
+
+def load_and_standardize_csv(csv_path: Path, region_slug: Optional[str] = None) -> pd.DataFrame:
+    from .config import REGIONS
+
+    df = _cached_read(csv_path)
+    if region_slug is None:
+        region_slug = find_region_slug(csv_path)
+    # Categorical with the shared region registry: int8 codes instead of one
+    # Python string per row, and concat keeps the dtype when all frames agree
+    if region_slug in REGIONS:
+        df["region"] = pd.Categorical([region_slug] * len(df), categories=list(REGIONS.keys()))
+    else:
+        df["region"] = region_slug
+    return df
+
+
+def discover_csvs(outputs_dir: Path) -> List[Tuple[Path, str]]:
     """Find regional *_cities.csv files under outputs_dir.
 
+    Returns (path, region_slug) pairs; the slug is the region folder already
+    identified during the walk, so callers don't re-derive it per path.
+
     Excludes:
     - cache folders
     - ignore_test_run
@@ -78,43 +127,64 @@ def discover_csvs(outputs_dir: Path) -> List[Path]:
     from .config import REGIONS
 
     known_region_slugs = set(REGIONS.keys())
-    aggregate_folders = {"all_mountains", "all_regions", "combined"}
-
-    candidates: List[Path] = []
-    # Recurse and collect
-    for path in outputs_dir.rglob("*_cities.csv"):
-        parts = list(path.parts)
-        parts_lower = [p.lower() for p in parts]
-        if any(seg in parts_lower for seg in ("cache", "ignore_test_run")):
-            continue
-
-        # Identify folder directly under outputs
-        try:
-            outputs_idx = parts_lower.index("outputs")
-        except ValueError:
-            # Not under outputs; skip
-            continue
-        region_folder = parts_lower[outputs_idx + 1] if outputs_idx + 1 < len(parts_lower) else path.parent.name.lower()
-
-        # Skip aggregate folders and non-region folders
-        if region_folder in aggregate_folders:
+    pruned_folders = {"cache", "ignore_test_run", "all_mountains", "all_regions", "combined"}
+
+    candidates: List[Tuple[Path, str]] = []
+    # Walk manually so excluded subtrees are pruned before they are visited,
+    # instead of stat-ing every entry with rglob and filtering afterwards.
+    for root, dirnames, filenames in os.walk(outputs_dir, followlinks=False):
+        dirnames[:] = [d for d in dirnames if d.lower() not in pruned_folders]
+        rel = os.path.relpath(root, outputs_dir)
+        if rel == ".":
+            # Files directly under outputs_dir have no region folder
             continue
+        region_folder = rel.split(os.sep, 1)[0].lower()
         if region_folder not in known_region_slugs:
+            dirnames[:] = []
             continue
-
-        candidates.append(path)
+        for fn in filenames:
+            if fn.endswith("_cities.csv"):
+                candidates.append((Path(root, fn), region_folder))
 
     return sorted(candidates)
 
 
+# Plotting libraries are imported lazily (matplotlib's first import runs font
+# cache / backend setup) and cached at module level so repeated combine() calls
+# only pay the import machinery once.
+plt = None
+sns = None
+px = None
+
+
+def _ensure_mpl() -> None:
+    global plt, sns
+    if plt is None:
+        import matplotlib
+
+        matplotlib.use("Agg")  # must be set before pyplot is imported
+        import matplotlib.pyplot as _plt
+        import seaborn as _sns
+
+        plt = _plt
+        sns = _sns
+
+
+def _ensure_plotly() -> None:
+    global px
+    if px is None:
+        import plotly.express as _px
+
+        px = _px
+
+
 def make_plots(df: pd.DataFrame, out_dir: Path) -> None:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
+    _ensure_mpl()
 
     out_dir.mkdir(parents=True, exist_ok=True)
     # Exclude aggregate folders to avoid duplicated points in plots
     if "region" in df.columns:
-        df = df[~df["region"].isin({"all_mountains", "combined"})].copy()
+        df = df[~df["region"].isin({"all_mountains", "combined"})]
     plot_style = {
         "s": 30,
         "alpha": 0.7,
@@ -123,7 +193,7 @@ def make_plots(df: pd.DataFrame, out_dir: Path) -> None:
 
     # Scatter 1: driving time to hospital vs airport
     cols_needed = ["driving_time_minutes_to_hospital", "driving_time_minutes_to_airport"]
-    df1 = df.dropna(subset=cols_needed).copy()
+    df1 = df.dropna(subset=cols_needed)
     if not df1.empty:
         plt.figure(figsize=(8, 6))
         sns.scatterplot(
@@ -137,13 +207,12 @@ def make_plots(df: pd.DataFrame, out_dir: Path) -> None:
         plt.ylabel("Driving time to airport (minutes)")
         plt.title("Cities: Hospital vs Airport Driving Time")
         plt.legend(title="Region", bbox_to_anchor=(1.05, 1), loc="upper left")
-        plt.tight_layout()
-        plt.savefig(out_dir / "scatter_hospital_time_vs_airport_time.png", dpi=150)
+        plt.savefig(out_dir / "scatter_hospital_time_vs_airport_time.png", dpi=150, bbox_inches="tight")
         plt.close()
 
     # Scatter 2: peaks count vs driving time to airport
     cols_needed = ["peaks_higher1200_within30km_count", "driving_time_minutes_to_airport"]
-    df2 = df.dropna(subset=cols_needed).copy()
+    df2 = df.dropna(subset=cols_needed)
     if not df2.empty:
         plt.figure(figsize=(8, 6))
         sns.scatterplot(
@@ -157,13 +226,12 @@ def make_plots(df: pd.DataFrame, out_dir: Path) -> None:
         plt.ylabel("Driving time to airport (minutes)")
         plt.title("Cities: Peaks vs Airport Driving Time")
         plt.legend(title="Region", bbox_to_anchor=(1.05, 1), loc="upper left")
-        plt.tight_layout()
-        plt.savefig(out_dir / "scatter_peaks_count_vs_airport_time.png", dpi=150)
+        plt.savefig(out_dir / "scatter_peaks_count_vs_airport_time.png", dpi=150, bbox_inches="tight")
         plt.close()
 
     # Scatter 3: population vs peaks count
     cols_needed = ["population", "peaks_higher1200_within30km_count"]
-    df3 = df.dropna(subset=cols_needed).copy()
+    df3 = df.dropna(subset=cols_needed)
     if not df3.empty:
         plt.figure(figsize=(8, 6))
         sns.scatterplot(
@@ -178,18 +246,17 @@ def make_plots(df: pd.DataFrame, out_dir: Path) -> None:
         plt.ylabel("# Peaks ≥1200m within 30 km")
         plt.title("Cities: Population vs Peaks")
         plt.legend(title="Region", bbox_to_anchor=(1.05, 1), loc="upper left")
-        plt.tight_layout()
-        plt.savefig(out_dir / "scatter_population_vs_peaks_count.png", dpi=150)
+        plt.savefig(out_dir / "scatter_population_vs_peaks_count.png", dpi=150, bbox_inches="tight")
         plt.close()
 
 
 def make_plots_interactive(df: pd.DataFrame, out_dir: Path) -> None:
-    import plotly.express as px
+    _ensure_plotly()
 
     out_dir.mkdir(parents=True, exist_ok=True)
     # Exclude aggregate folders to avoid duplicated points in plots
     if "region" in df.columns:
-        df = df[~df["region"].isin({"all_mountains", "combined"})].copy()
+        df = df[~df["region"].isin({"all_mountains", "combined"})]
 
     common_hover = {
         "hover_name": "name",
@@ -205,7 +272,7 @@ def make_plots_interactive(df: pd.DataFrame, out_dir: Path) -> None:
 
     # Interactive 1: driving time to hospital vs airport
     cols_needed = ["driving_time_minutes_to_hospital", "driving_time_minutes_to_airport", "name"]
-    df1 = df.dropna(subset=cols_needed).copy()
+    df1 = df.dropna(subset=cols_needed)
     if not df1.empty:
         fig = px.scatter(
             df1,
@@ -213,13 +280,14 @@ def make_plots_interactive(df: pd.DataFrame, out_dir: Path) -> None:
             y="driving_time_minutes_to_airport",
             **common_hover,
             title="Cities: Hospital vs Airport Driving Time (interactive)",
+            render_mode="webgl",
         )
         fig.update_traces(marker=dict(size=7, opacity=0.75))
         fig.write_html(out_dir / "scatter_hospital_time_vs_airport_time.html", include_plotlyjs="cdn")
 
     # Interactive 2: peaks count vs driving time to airport
     cols_needed = ["peaks_higher1200_within30km_count", "driving_time_minutes_to_airport", "name"]
-    df2 = df.dropna(subset=cols_needed).copy()
+    df2 = df.dropna(subset=cols_needed)
     if not df2.empty:
         fig = px.scatter(
             df2,
@@ -227,13 +295,14 @@ def make_plots_interactive(df: pd.DataFrame, out_dir: Path) -> None:
             y="driving_time_minutes_to_airport",
             **common_hover,
             title="Cities: Peaks vs Airport Driving Time (interactive)",
+            render_mode="webgl",
         )
         fig.update_traces(marker=dict(size=7, opacity=0.75))
         fig.write_html(out_dir / "scatter_peaks_count_vs_airport_time.html", include_plotlyjs="cdn")
 
     # Interactive 3: population vs peaks count
     cols_needed = ["population", "peaks_higher1200_within30km_count", "name"]
-    df3 = df.dropna(subset=cols_needed).copy()
+    df3 = df.dropna(subset=cols_needed)
     if not df3.empty:
         fig = px.scatter(
             df3,
@@ -242,14 +311,14 @@ def make_plots_interactive(df: pd.DataFrame, out_dir: Path) -> None:
             **common_hover,
             title="Cities: Population vs Peaks (interactive)",
             log_x=True,
+            render_mode="webgl",
         )
         fig.update_traces(marker=dict(size=7, opacity=0.75))
         fig.write_html(out_dir / "scatter_population_vs_peaks_count.html", include_plotlyjs="cdn")
 
 
 def extra_analyses(df: pd.DataFrame, out_dir: Path) -> None:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
+    _ensure_mpl()
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -267,15 +336,36 @@ def extra_analyses(df: pd.DataFrame, out_dir: Path) -> None:
     ]
     present = [c for c in numeric_summary_cols if c in df.columns]
     if present:
-        summary_by_region = df.groupby("region")[present].agg(["count", "mean", "median", "min", "max"]).round(2)
+        # median forces a per-group sort, so compute the cheap cythonized
+        # stats in one pass and join the medians separately
+        grouped = df.groupby("region", sort=False, observed=True)[present]
+        summary_by_region = grouped.agg(["count", "mean", "min", "max"])
+        medians = grouped.median()
+        medians.columns = pd.MultiIndex.from_product([medians.columns, ["median"]])
+        summary_by_region = summary_by_region.join(medians)
+        summary_by_region = summary_by_region[
+            [(c, stat) for c in present for stat in ("count", "mean", "median", "min", "max")]
+        ].round(2)
         # Flatten MultiIndex columns
         summary_by_region.columns = ["_".join(col).strip("_") for col in summary_by_region.columns.values]
         summary_by_region.to_csv(out_dir / "summary_by_region.csv")
 
-    # Correlation heatmap (numeric columns only)
-    numeric_df = df.select_dtypes(include=[np.number]).copy()
+    # Correlation heatmap (numeric columns only). Computed as one BLAS
+    # matmul on a standardized float32 matrix rather than pandas' per-pair
+    # corr loop; missing values are zero-filled after standardization, which
+    # approximates pairwise-complete handling and is fine for a heatmap.
+    numeric_df = df.select_dtypes(include=[np.number])
     if not numeric_df.empty:
-        corr = numeric_df.corr(numeric_only=True)
+        X = numeric_df.to_numpy(dtype=np.float32)
+        mask = ~np.isnan(X)
+        mean = np.nanmean(X, axis=0)
+        std = np.nanstd(X, axis=0, ddof=1)
+        std = np.where(std > 0, std, np.nan)  # constant columns -> NaN, as pandas does
+        Z = np.where(mask, (X - mean) / std, 0.0)
+        denom = np.maximum(mask.sum(axis=0) - 1, 1)
+        corr = pd.DataFrame(
+            (Z.T @ Z) / denom, index=numeric_df.columns, columns=numeric_df.columns
+        )
         plt.figure(figsize=(10, 8))
         sns.heatmap(corr, cmap="vlag", center=0, annot=False)
         plt.title("Correlation Heatmap (numeric columns)")
@@ -285,35 +375,46 @@ def extra_analyses(df: pd.DataFrame, out_dir: Path) -> None:
 
 
 def combine(outputs_dir: Path, out_dir: Path) -> Path:
-    csv_paths = discover_csvs(outputs_dir)
-    if not csv_paths:
+    discovered = discover_csvs(outputs_dir)
+    if not discovered:
         raise FileNotFoundError(f"No '*_cities.csv' files found under {outputs_dir}")
 
-    frames: List[pd.DataFrame] = []
-    for path in csv_paths:
-        region_slug = find_region_slug(path)
-        frames.append(load_and_standardize_csv(path, region_slug))
+    # Load per-region CSVs in parallel; pandas' C parser and file I/O release
+    # the GIL, and ex.map keeps the frame order deterministic for concat.
+    with ThreadPoolExecutor(max_workers=min(8, len(discovered))) as ex:
+        frames: List[pd.DataFrame] = list(
+            ex.map(lambda item: load_and_standardize_csv(item[0], item[1]), discovered)
+        )
 
     combined = pd.concat(frames, ignore_index=True, sort=False)
-
-    # Guard: drop duplicates that might arise from overlapping inputs
-    # Use a stable city key based on name and coordinates
-    for col in ("name", "latitude", "longitude"):
-        if col not in combined.columns:
-            combined[col] = combined.get(col, "")
-    combined["__key"] = (
-        combined["name"].astype(str).str.strip()
-        + "|"
-        + combined["latitude"].astype(str).str.strip()
-        + "|"
-        + combined["longitude"].astype(str).str.strip()
-    )
-    before = len(combined)
-    combined = combined.drop_duplicates(subset="__key").drop(columns=["__key"])  # keep first occurrence
+    if combined["region"].dtype == object:
+        combined["region"] = combined["region"].astype("category")
+
+    # Guard: drop duplicates that might arise from overlapping inputs,
+    # keyed on name and coordinates. Hashing the columns directly avoids
+    # synthesizing an auxiliary string key per row.
+    missing = [col for col in ("name", "latitude", "longitude") if col not in combined.columns]
+    if missing:
+        combined = combined.reindex(columns=[*combined.columns, *missing])
+    combined["name"] = combined["name"].astype("string").str.strip()
+    combined = combined.drop_duplicates(subset=["name", "latitude", "longitude"], keep="first", ignore_index=True)
 
     out_dir.mkdir(parents=True, exist_ok=True)
     combined_csv = out_dir / "all_regions_cities.csv"
-    combined.to_csv(combined_csv, index=False)
+    # Arrow's columnar CSV writer avoids to_csv's per-row Python formatting;
+    # fall back to pandas if the frame can't be converted cleanly
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        pacsv.write_csv(pa.Table.from_pandas(combined, preserve_index=False), str(combined_csv))
+    except Exception:
+        combined.to_csv(combined_csv, index=False)
+    # Parquet twin for downstream consumers: smaller and much faster to re-read
+    try:
+        combined.to_parquet(out_dir / "all_regions_cities.parquet", index=False)
+    except Exception:
+        pass
 
     # Generate plots and extra analyses
     make_plots(combined, out_dir)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Optional, Set
 
+import numpy as np
 from shapely.geometry import Point, Polygon, box
 from .country_lookup import infer_country_iso_a2
 
@@ -13,6 +14,9 @@ SI_BOX: Polygon = box(13.37, 45.40, 16.61, 46.88)  # Slovenia
 LI_BOX: Polygon = box(9.47, 47.05, 9.64, 47.27)    # Liechtenstein
 
 EXCLUDED_BOXES: List[Polygon] = [SI_BOX, LI_BOX]
+# Axis-aligned bounds (minx, miny, maxx, maxy); the polygons above are kept
+# for API compatibility but the hot paths only need float comparisons
+_EXCLUDED_BBOX_BOUNDS: List[tuple] = [b.bounds for b in EXCLUDED_BOXES]
 
 # Rough bounding boxes for included countries to infer missing country codes
 AT_BOX: Polygon = box(9.53, 46.37, 17.16, 49.02)
@@ -41,20 +45,78 @@ def should_exclude_record(record: Dict, excluded_codes: Optional[Iterable[str]]
         try:
             lat = float(record["latitude"])  # type: ignore[index]
             lon = float(record["longitude"])  # type: ignore[index]
-            pt = Point(lon, lat)
-            for bbox in EXCLUDED_BOXES:
-                if bbox.contains(pt):
+            for minx, miny, maxx, maxy in _EXCLUDED_BBOX_BOUNDS:
+                if minx <= lon <= maxx and miny <= lat <= maxy:
                     return True
         except Exception:
             pass
     return False
 
 
+def _coord_arrays(records_list: List[Dict]) -> tuple[np.ndarray, np.ndarray]:
+    """Extract latitude/longitude into float64 arrays (NaN where unparsable)."""
+    n = len(records_list)
+    lat = np.full(n, np.nan)
+    lon = np.full(n, np.nan)
+    for i, r in enumerate(records_list):
+        try:
+            lat[i] = float(r["latitude"])
+            lon[i] = float(r["longitude"])
+        except Exception:
+            pass
+    return lat, lon
+
+
+def _excluded_mask(countries: List[str], lat: np.ndarray, lon: np.ndarray, excluded: Set[str]) -> np.ndarray:
+    """Vectorized exclusion test over all records at once.
+
+    Country-code membership plus, for records without a code, a rough bbox
+    test. The bbox test is four float comparisons per box done across the
+    whole arrays instead of one shapely Point + contains call per record.
+    """
+    country_mask = np.fromiter((c in excluded for c in countries), dtype=bool, count=len(countries))
+    no_country = np.fromiter((not c for c in countries), dtype=bool, count=len(countries))
+    bbox_masks = []
+    for minx, miny, maxx, maxy in _EXCLUDED_BBOX_BOUNDS:
+        bbox_masks.append((lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy))
+    bbox_mask = np.logical_or.reduce(bbox_masks) if bbox_masks else np.zeros(len(countries), dtype=bool)
+    return country_mask | (no_country & bbox_mask)
+
+
 def filter_excluded_countries(records: Iterable[Dict], excluded_codes: Optional[Iterable[str]] = None) -> List[Dict]:
-    return [r for r in records if not should_exclude_record(r, excluded_codes=excluded_codes)]
+    records_list = list(records)
+    if not records_list:
+        return []
+    excluded: Set[str] = set(EXCLUDED_COUNTRY_CODES if excluded_codes is None else [str(c).upper() for c in excluded_codes])
+    countries = [str(r.get("country", "")).upper() for r in records_list]
+    lat, lon = _coord_arrays(records_list)
+    mask = _excluded_mask(countries, lat, lon, excluded)
+    return [r for r, drop in zip(records_list, mask) if not drop]
+
+
+def filter_excluded_countries_df(df, excluded_codes: Optional[Iterable[str]] = None):
+    """DataFrame variant of filter_excluded_countries; returns the kept rows."""
+    if df.empty:
+        return df
+    excluded: Set[str] = set(EXCLUDED_COUNTRY_CODES if excluded_codes is None else [str(c).upper() for c in excluded_codes])
+    countries = df["country"].fillna("").astype(str).str.upper()
+    country_mask = countries.isin(excluded).to_numpy()
+    lat = df["latitude"].to_numpy(dtype=np.float64, na_value=np.nan)
+    lon = df["longitude"].to_numpy(dtype=np.float64, na_value=np.nan)
+    bbox_masks = []
+    for minx, miny, maxx, maxy in _EXCLUDED_BBOX_BOUNDS:
+        bbox_masks.append((lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy))
+    bbox_mask = np.logical_or.reduce(bbox_masks) if bbox_masks else np.zeros(len(df), dtype=bool)
+    mask = country_mask | ((countries == "").to_numpy() & bbox_mask)
+    return df.loc[~mask]
 
 
 def fill_missing_country(records: Iterable[Dict], allowed_countries: Optional[Iterable[str]] = None) -> List[Dict]:
+    """Fill empty country codes via boundary inference.
+
+    Mutates the record dicts in place (no per-record copy) and returns them
+    as a list for convenience.
+    """
     filled: List[Dict] = []
     for r in records:
         country = str(r.get("country", "")).upper()
@@ -66,7 +128,7 @@ def fill_missing_country(records: Iterable[Dict], allowed_countries: Optional[It
             lon = float(r["longitude"])  # type: ignore[index]
             inferred = infer_country_iso_a2(lat, lon, allowed=allowed_countries)
             if inferred:
-                r = {**r, "country": inferred}
+                r["country"] = inferred
         except Exception:
             pass
         filled.append(r)
@@ -77,7 +139,7 @@ def enforce_country_by_boundary(records: Iterable[Dict], allowed_countries: Opti
     """Force country to match boundary-inferred ISO A2 for each record.
 
     If allowed_countries is provided, restrict inference to that set. If inference
-    fails, keep the existing country value.
+    fails, keep the existing country value. Mutates the record dicts in place.
     """
     fixed: List[Dict] = []
     for r in records:
@@ -94,26 +156,64 @@ def enforce_country_by_boundary(records: Iterable[Dict], allowed_countries: Opti
             inferred = ""
         if inferred:
             if str(r.get("country", "")).upper() != inferred:
-                r = {**r, "country": inferred}
+                r["country"] = inferred
         fixed.append(r)
     return fixed
 
 
+# Conflict-resolution priority for the Alps (CH first for proper Swiss city assignment)
+_RESOLUTION_PRIORITY = [
+    ("CH", CH_BOX),
+    ("AT", AT_BOX),
+    ("IT", IT_BOX),
+    ("DE", DE_BOX),
+    ("FR", FR_BOX),
+]
+_PRIORITY_CODES: List[str] = [code for code, _ in _RESOLUTION_PRIORITY]
+# Plain float tuples for the scalar path; NumPy array for the batched path
+_PRIORITY_BOUNDS_TUPLES: List[tuple] = [bbox.bounds for _, bbox in _RESOLUTION_PRIORITY]
+_PRIORITY_BOUNDS: np.ndarray = np.array(_PRIORITY_BOUNDS_TUPLES)
+_PRIORITY_TABLE = list(zip(_PRIORITY_CODES, _PRIORITY_BOUNDS_TUPLES))
+
+
 def infer_country_by_bbox(lat: float, lon: float) -> str:
     """Infer ISO 3166-1 alpha-2 country from rough bbox membership.
 
     Uses an order tuned for Central Europe; works reasonably for Alps and Pyrenees.
     """
-    pt = Point(lon, lat)
-    # Conflict-resolution priority for the Alps (CH first for proper Swiss city assignment)
-    resolution_priority = [
-        ("CH", CH_BOX),
-        ("AT", AT_BOX),
-        ("IT", IT_BOX),
-        ("DE", DE_BOX),
-        ("FR", FR_BOX),
-    ]
-    for code, bbox in resolution_priority:
-        if bbox.contains(pt):
+    for code, (minx, miny, maxx, maxy) in _PRIORITY_TABLE:
+        if minx <= lon <= maxx and miny <= lat <= maxy:
             return code
     return ""
+
+
+def infer_country_by_bbox_vec(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Vectorized infer_country_by_bbox over coordinate arrays.
+
+    Applies the same priority order; each box only claims records not yet
+    assigned by a higher-priority box. Returns an object array of ISO A2
+    codes with "" where no box matches.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    out = np.full(lat.shape, "", dtype=object)
+    unassigned = np.ones(lat.shape, dtype=bool)
+    for code, (minx, miny, maxx, maxy) in zip(_PRIORITY_CODES, _PRIORITY_BOUNDS):
+        hit = unassigned & (lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy)
+        out[hit] = code
+        unassigned &= ~hit
+        if not unassigned.any():
+            break
+    return out
+
+
+def fill_missing_country_vec(lat: np.ndarray, lon: np.ndarray, existing: np.ndarray) -> np.ndarray:
+    """Fill empty country codes from bbox inference across whole arrays."""
+    existing = np.asarray(existing, dtype=object)
+    empty = np.fromiter(
+        (not str(c or "").strip() for c in existing), dtype=bool, count=len(existing)
+    )
+    if not empty.any():
+        return existing
+    inferred = infer_country_by_bbox_vec(lat, lon)
+    return np.where(empty, inferred, existing)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import functools
 import json
+import pickle
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+import numpy as np
 import requests
+import shapely
 from shapely.geometry import Point, shape
 from shapely.strtree import STRtree
 
@@ -19,6 +23,7 @@ class CountryBoundaryIndex:
 
     _CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
     _CACHE_FILE = _CACHE_DIR / "ne_50m_admin_0_countries.geojson"
+    _CACHE_PKL = _CACHE_DIR / "countries.pkl"
     _DOWNLOAD_URLS = [
         # Primary: Natural Earth official mirror (GitHub)
         "https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_50m_admin_0_countries.geojson",
@@ -29,9 +34,8 @@ class CountryBoundaryIndex:
     _instance: Optional["CountryBoundaryIndex"] = None
 
     def __init__(self, features: List[Dict]):
-        self._geoms: List = []
-        self._codes: List[str] = []
-        self._geom_wkb_to_code: Dict[bytes, str] = {}
+        geoms: List = []
+        codes: List[str] = []
         for feat in features:
             props = feat.get("properties", {})
             # Try multiple property names that may contain ISO A2
@@ -54,25 +58,85 @@ class CountryBoundaryIndex:
                 geom = shape(feat.get("geometry"))
             except Exception:
                 continue
-            self._geoms.append(geom)
-            self._codes.append(code)
+            geoms.append(geom)
+            codes.append(code)
+        self._init_from_geoms(geoms, codes)
+
+    def _init_from_geoms(self, geoms: List, codes: List[str]) -> None:
+        self._geoms = geoms
+        self._codes = codes
+        # Object array of codes for O(1) fancy indexing from query results
+        self._codes_arr = np.asarray(codes, dtype=object)
+
+        # Prepare geometries once so point predicates hit the GEOS fast path
+        for geom in self._geoms:
             try:
-                self._geom_wkb_to_code[geom.wkb] = code
+                shapely.prepare(geom)
             except Exception:
                 pass
 
-        # Build spatial index
-        self._tree = STRtree(self._geoms)
-        # Keep parallel lists for index-based fallback
-        self._index_to_code: List[str] = list(self._codes)
+        # Vectorized bounds array (minx, miny, maxx, maxy) for cheap
+        # candidate prefiltering of scalar lookups
+        if geoms:
+            self._bounds = shapely.bounds(np.asarray(geoms, dtype=object))
+        else:
+            self._bounds = np.empty((0, 4))
+
+        # Build spatial index; a small leaf capacity gives a deeper tree and
+        # tighter candidate lists for point queries against ~250 countries
+        self._tree = STRtree(self._geoms, node_capacity=10)
+        # Lazily built per-allowed-set subtrees for the nearest fallback
+        self._subtrees: Dict[frozenset, Tuple[STRtree, np.ndarray]] = {}
 
     @classmethod
     def instance(cls) -> "CountryBoundaryIndex":
         if cls._instance is None:
-            features = cls._load_or_download()
-            cls._instance = CountryBoundaryIndex(features)
+            cached = cls._from_pickle_cache()
+            if cached is not None:
+                cls._instance = cached
+            else:
+                features = cls._load_or_download()
+                cls._instance = CountryBoundaryIndex(features)
+                cls._instance._save_pickle_cache()
         return cls._instance
 
+    @classmethod
+    def _from_pickle_cache(cls) -> Optional["CountryBoundaryIndex"]:
+        """Rehydrate the index from the pickled (wkb, codes) arrays.
+
+        Skips the GeoJSON parse and per-feature shape() construction on
+        every interpreter start; from_wkb rebuilds all geometries in one
+        vectorized GEOS call.
+        """
+        if not cls._CACHE_PKL.exists():
+            return None
+        try:
+            with open(cls._CACHE_PKL, "rb") as f:
+                payload = pickle.load(f)
+            geoms = list(shapely.from_wkb(payload["wkb"]))
+            codes = [str(c) for c in payload["codes"]]
+            if len(geoms) != len(codes):
+                return None
+        except Exception:
+            return None
+        obj = cls.__new__(cls)
+        obj._init_from_geoms(geoms, codes)
+        return obj
+
+    def _save_pickle_cache(self) -> None:
+        if not self._geoms:
+            return
+        try:
+            self._CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "wkb": shapely.to_wkb(np.asarray(self._geoms, dtype=object)),
+                "codes": np.asarray(self._codes, dtype=object),
+            }
+            with open(self._CACHE_PKL, "wb") as f:
+                pickle.dump(payload, f, protocol=5)
+        except Exception:
+            pass
+
     @classmethod
     def _load_or_download(cls) -> List[Dict]:
         cls._CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -103,81 +167,123 @@ class CountryBoundaryIndex:
         return []
 
     def lookup_iso_a2(self, lat: float, lon: float, allowed: Optional[Iterable[str]] = None) -> str:
-        pt = Point(lon, lat)
-        raw_candidates = self._tree.query(pt)
-        try:
-            candidates_list = list(raw_candidates)
-        except Exception:
-            candidates_list = [raw_candidates]
-        if len(candidates_list) == 0:
+        # Candidate prefilter on the precomputed bounds array: four float
+        # comparisons across all countries, no Point construction and no
+        # tree traversal for the common miss case
+        b = self._bounds
+        if len(b) == 0:
+            return ""
+        mask = (b[:, 0] <= lon) & (lon <= b[:, 2]) & (b[:, 1] <= lat) & (lat <= b[:, 3])
+        candidate_idx = np.nonzero(mask)[0]
+        if len(candidate_idx) == 0:
             return ""
         allowed_set: Optional[Set[str]] = set(x.upper() for x in allowed) if allowed else None
+        pt = Point(lon, lat)
 
-        # Normalize candidates to (geom, code)
-        norm: List[Tuple[object, str]] = []
-        for c in candidates_list:
-            # Shapely 2 often returns integer indices; convert to geom+code
-            idx = None
-            try:
-                idx = int(c)
-            except Exception:
-                idx = None
-            if idx is not None and 0 <= idx < len(self._geoms):
-                geom = self._geoms[idx]
-                code = self._codes[idx]
-                norm.append((geom, code))
-            else:
-                geom = c
-                try:
-                    code = self._geom_wkb_to_code.get(geom.wkb, "")  # type: ignore[attr-defined]
-                except Exception:
-                    code = ""
-                norm.append((geom, code))
+        norm: List[Tuple[object, str]] = [
+            (self._geoms[i], self._codes[i]) for i in candidate_idx.tolist()
+        ]
 
-        # Prefer true containment
+        # Single pass over the candidates, in priority order: containment
+        # returns immediately (contains_xy hits the prepared-geometry fast
+        # path), boundary touches and nearest distance are tracked along the
+        # way. The cheap code/allowed filter runs before any GEOS predicate.
+        touch_code = ""
+        any_code = ""
         for geom, code in norm:
-            try:
-                if getattr(geom, "contains", lambda *_: False)(pt):
-                    if code and (allowed_set is None or code in allowed_set):
-                        return code
-            except Exception:
+            if not code:
+                continue
+            if not any_code:
+                any_code = code
+            if allowed_set is not None and code not in allowed_set:
                 continue
-
-        # Next, allow boundary touches
-        for geom, code in norm:
             try:
-                if getattr(geom, "touches", lambda *_: False)(pt):
-                    if code and (allowed_set is None or code in allowed_set):
-                        return code
+                if shapely.contains_xy(geom, lon, lat):
+                    return code
+                if not touch_code and geom.touches(pt):
+                    touch_code = code
             except Exception:
                 continue
+        if touch_code:
+            return touch_code
+        # If no predicate matched, pick the nearest (allowed) country via the
+        # tree's native nearest query instead of a Python distance loop
+        nearest_code = self._nearest_code(pt, allowed_set)
+        if nearest_code:
+            return nearest_code
+        # Fallback: return any candidate's code
+        return any_code
 
-        # If none matched predicate, choose nearest among allowed
-        best_code = ""
-        best_dist = float("inf")
-        for geom, code in norm:
-            try:
-                if not code:
-                    continue
-                if allowed_set is not None and code not in allowed_set:
-                    continue
-                d = getattr(geom, "distance", lambda *_: float("inf"))(pt)
-                if d < best_dist:
-                    best_dist = d
-                    best_code = code
-            except Exception:
+    def _nearest_code(self, pt: Point, allowed_set: Optional[Set[str]]) -> str:
+        """Code of the nearest geometry, optionally restricted to allowed codes.
+
+        Restricted queries use a lazily built STRtree over just the allowed
+        geometries, cached per allowed set, so the fallback stays a single
+        GEOS nearest call instead of per-candidate distance computations.
+        """
+        try:
+            if allowed_set is None:
+                idx = self._tree.nearest(pt)
+                return self._codes[int(idx)] if idx is not None else ""
+            key = frozenset(allowed_set)
+            entry = self._subtrees.get(key)
+            if entry is None:
+                sel = np.nonzero(np.isin(self._codes_arr, list(key)))[0]
+                if len(sel) == 0:
+                    return ""
+                entry = (STRtree([self._geoms[i] for i in sel], node_capacity=10), sel)
+                self._subtrees[key] = entry
+            subtree, sel = entry
+            idx = subtree.nearest(pt)
+            return self._codes[int(sel[int(idx)])] if idx is not None else ""
+        except Exception:
+            return ""
+
+
+    def lookup_iso_a2_many(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        allowed: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Batched lookup over coordinate arrays.
+
+        Resolves all point-in-polygon hits with a single STRtree query
+        (one GEOS call instead of one per point); points left unresolved
+        fall back to the scalar lookup for its touch/nearest handling.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        out: List[str] = [""] * len(lats)
+        if not self._geoms:
+            return out
+        allowed_set: Optional[Set[str]] = set(x.upper() for x in allowed) if allowed else None
+        pts = shapely.points(lons, lats)
+        input_idx, tree_idx = self._tree.query(pts, predicate="intersects")
+        hit_codes = self._codes_arr[tree_idx]
+        for i, code in zip(input_idx.tolist(), hit_codes.tolist()):
+            if out[i]:
                 continue
-        if best_code:
-            return best_code
+            if code and (allowed_set is None or code in allowed_set):
+                out[i] = code
+        for i, code in enumerate(out):
+            if not code:
+                out[i] = self.lookup_iso_a2(float(lats[i]), float(lons[i]), allowed=allowed)
+        return out
 
-        # Fallback: return any candidate's code
-        for _, code in norm:
-            if code:
-                return code
-        return ""
+
+@functools.lru_cache(maxsize=65536)
+def _cached_lookup(lat_q: int, lon_q: int, allowed_key: Optional[Tuple[str, ...]]) -> str:
+    return CountryBoundaryIndex.instance().lookup_iso_a2(
+        lat_q / 1000.0, lon_q / 1000.0, allowed=allowed_key
+    )
 
 
 def infer_country_iso_a2(lat: float, lon: float, allowed: Optional[Iterable[str]] = None) -> str:
-    return CountryBoundaryIndex.instance().lookup_iso_a2(lat, lon, allowed=allowed)
+    # Quantize to ~100 m — lossless at country resolution — so repeated
+    # lookups near the same spot (duplicate records, peaks around one city)
+    # hit the LRU cache instead of the STRtree
+    allowed_key = tuple(sorted(str(c).upper() for c in allowed)) if allowed else None
+    return _cached_lookup(int(round(lat * 1000)), int(round(lon * 1000)), allowed_key)
 
 
@@ -1,5 +1,9 @@
 import logging
 from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import shapely
+from pyproj import Geod
 from shapely.geometry import Point, Polygon, MultiPolygon
 from shapely.ops import nearest_points
 from shapely.validation import make_valid
@@ -7,6 +11,14 @@ from shapely.errors import TopologicalError
 
 logger = logging.getLogger(__name__)
 
+# WGS84 geodesic solver; Geod.inv accepts scalars or arrays and runs in C
+_GEOD = Geod(ellps="WGS84")
+
+def _geodesic_km(lat1, lon1, lat2, lon2):
+    """WGS84 geodesic distance in km; vectorized over array inputs."""
+    _, _, meters = _GEOD.inv(lon1, lat1, lon2, lat2)
+    return np.asarray(meters) / 1000.0
+
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate great circle distance between two points using Haversine formula."""
     import math
@@ -24,67 +36,39 @@ def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     r = 6371.0
     return r * c
 
-def _vincenty_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance using Vincenty formula (more accurate than Haversine)."""
-    import math
-    
-    # Convert to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    
-    # WGS84 ellipsoid parameters
-    a = 6378.137  # semi-major axis in km
-    f = 1/298.257223563  # flattening
-    b = a * (1 - f)  # semi-minor axis
-    
-    L = lon2 - lon1
-    U1 = math.atan((1 - f) * math.tan(lat1))
-    U2 = math.atan((1 - f) * math.tan(lat2))
-    
-    sinU1 = math.sin(U1)
-    cosU1 = math.cos(U1)
-    sinU2 = math.sin(U2)
-    cosU2 = math.cos(U2)
-    
-    lambda_ = L
-    iterLimit = 100
-    
-    while iterLimit > 0:
-        sinLambda = math.sin(lambda_)
-        cosLambda = math.cos(lambda_)
-        sinSigma = math.sqrt((cosU2 * sinLambda) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cosLambda) ** 2)
-        
-        if sinSigma == 0:
-            return 0.0
-        
-        cosSigma = sinU1 * sinU2 + cosU1 * cosU2 * cosLambda
-        sigma = math.atan2(sinSigma, cosSigma)
-        sinAlpha = cosU1 * cosU2 * sinLambda / sinSigma
-        cosSqAlpha = 1 - sinAlpha ** 2
-        
-        try:
-            cos2SigmaM = cosSigma - 2 * sinU1 * sinU2 / cosSqAlpha
-        except ZeroDivisionError:
-            cos2SigmaM = 0
-        
-        C = f / 16 * cosSqAlpha * (4 + f * (4 - 3 * cosSqAlpha))
-        lambdaP = lambda_
-        lambda_ = L + (1 - C) * f * sinAlpha * (sigma + C * sinSigma * (cos2SigmaM + C * cosSigma * (-1 + 2 * cos2SigmaM ** 2)))
-        
-        if abs(lambda_ - lambdaP) <= 1e-12:
-            break
-        iterLimit -= 1
-    
-    if iterLimit == 0:
-        # Fallback to Haversine if Vincenty fails
-        return _haversine_km(math.degrees(lat1), math.degrees(lon1), math.degrees(lat2), math.degrees(lon2))
-    
-    uSq = cosSqAlpha * (a ** 2 - b ** 2) / b ** 2
-    A = 1 + uSq / 16384 * (4096 + uSq * (-768 + uSq * (320 - 175 * uSq)))
-    B = uSq / 1024 * (256 + uSq * (-128 + uSq * (74 - 47 * uSq)))
-    deltaSigma = B * sinSigma * (cos2SigmaM + B / 4 * (cosSigma * (-1 + 2 * cos2SigmaM ** 2) - B / 6 * cos2SigmaM * (-3 + 4 * sinSigma ** 2) * (-3 + 4 * cos2SigmaM ** 2)))
-    
-    s = b * A * (sigma - deltaSigma)
-    return s
+def _haversine_km_vec(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Vectorized Haversine distance (km) over coordinate arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * 6371.0 * np.arcsin(np.sqrt(a))
+
+def _canonicalize_polygonal(geom) -> Optional[Union[Polygon, MultiPolygon]]:
+    """Reduce a geometry to its polygonal parts as a Polygon/MultiPolygon.
+
+    make_valid can return a GeometryCollection with stray lines or points;
+    keeping only the polygon parts ensures .boundary and containment behave
+    downstream.
+    """
+    try:
+        parts = shapely.get_parts(geom) if geom.geom_type == "GeometryCollection" else [geom]
+        polys: List[Polygon] = []
+        for part in parts:
+            type_id = shapely.get_type_id(part)
+            if type_id == 3:  # Polygon
+                polys.append(part)
+            elif type_id == 6:  # MultiPolygon
+                polys.extend(shapely.get_parts(part))
+        if not polys:
+            return None
+        if len(polys) == 1:
+            return polys[0]
+        return MultiPolygon(polys)
+    except Exception:
+        return None
 
 def _validate_and_fix_polygon(perimeter: Union[Polygon, MultiPolygon]) -> Optional[Union[Polygon, MultiPolygon]]:
     """Validate and fix polygon geometry if needed."""
@@ -92,8 +76,13 @@ def _validate_and_fix_polygon(perimeter: Union[Polygon, MultiPolygon]) -> Option
         if perimeter.is_valid:
             return perimeter
         
-        # Try to fix invalid geometry
+        # Try to fix invalid geometry; canonicalize to polygonal parts since
+        # make_valid may emit a GeometryCollection
         fixed = make_valid(perimeter)
+        canonical = _canonicalize_polygonal(fixed)
+        if canonical is not None and canonical.is_valid:
+            logger.info("Fixed invalid polygon geometry")
+            return canonical
         if fixed.is_valid:
             logger.info("Fixed invalid polygon geometry")
             return fixed
@@ -103,7 +92,7 @@ def _validate_and_fix_polygon(perimeter: Union[Polygon, MultiPolygon]) -> Option
                 simplified = fixed.simplify(0.001)  # Simplify with 1km tolerance
                 if simplified.is_valid:
                     logger.info("Simplified polygon geometry successfully")
-                    return simplified
+                    return _canonicalize_polygonal(simplified) or simplified
             except Exception:
                 pass
             
@@ -122,12 +111,12 @@ def _calculate_distance_to_polygon(pt: Point, perimeter: Union[Polygon, MultiPol
         # Find nearest point on boundary
         nearest = nearest_points(perimeter.boundary, pt)[0]
         
-        # Try Vincenty first (more accurate)
+        # Try the WGS84 geodesic first (more accurate)
         try:
-            dist_km = _vincenty_km(
+            dist_km = float(_geodesic_km(
                 pt.y, pt.x,  # lat, lon
                 nearest.y, nearest.x  # lat, lon
-            )
+            ))
             return dist_km
         except Exception:
             # Fallback to Haversine
@@ -148,10 +137,10 @@ def _calculate_centroid_distance(pt: Point, perimeter: Union[Polygon, MultiPolyg
     """Calculate distance from point to polygon centroid as fallback."""
     try:
         centroid = perimeter.centroid
-        dist_km = _vincenty_km(
+        dist_km = float(_geodesic_km(
             pt.y, pt.x,  # lat, lon
             centroid.y, centroid.x  # lat, lon
-        )
+        ))
         return dist_km
     except Exception:
         # Fallback to Haversine
@@ -194,62 +183,109 @@ def add_distance_to_perimeter_km(
 
     Writes the distance into a region-agnostic field name: distance_km_to_perimeter.
     For backward compatibility, also fills distance_km_to_<slug> (e.g., _to_alps).
+    Mutates the record dicts in place and returns them as a list.
     """
     
+    records_list = list(records)
+
     # Validate and fix polygon if needed
     valid_perimeter = _validate_and_fix_polygon(perimeter)
     if not valid_perimeter:
         logger.error("Invalid perimeter geometry, cannot calculate distances")
-        return [
-            {**r, "distance_km_to_perimeter": None, f"distance_km_to_{region_slug}": None}
-            for r in records
-        ]
+        for r in records_list:
+            r["distance_km_to_perimeter"] = None
+            r[f"distance_km_to_{region_slug}"] = None
+        return records_list
     
     logger.info(f"Calculating distances using perimeter with bounds: {valid_perimeter.bounds}")
-    
-    updated: List[Dict] = []
+
+    # Prepare the (possibly complex) perimeter once; prepared state sticks to
+    # the geometry, so both the batched predicates below and the scalar
+    # fallback helpers reuse the same GEOS index instead of rebuilding it
+    # per containment test
+    try:
+        shapely.prepare(valid_perimeter)
+    except Exception:
+        pass
+
+    # Batched path: parse coordinates into arrays once, test containment for
+    # all points in one GEOS call, and get nearest-boundary points for the
+    # outside ones via vectorized shortest_line instead of per-record
+    # Point + nearest_points + scalar trig.
+    n = len(records_list)
+    try:
+        # Fast path: one fromiter pass per axis when every record parses
+        lats = np.fromiter((r["latitude"] for r in records_list), dtype=np.float64, count=n)
+        lons = np.fromiter((r["longitude"] for r in records_list), dtype=np.float64, count=n)
+    except Exception:
+        # Some records have missing/invalid coordinates; mark those NaN
+        lats = np.full(n, np.nan)
+        lons = np.full(n, np.nan)
+        for i, r in enumerate(records_list):
+            try:
+                lats[i] = float(r["latitude"])
+                lons[i] = float(r["longitude"])
+            except Exception:
+                pass
+    parsed = ~(np.isnan(lats) | np.isnan(lons))
+    dists = np.full(n, np.nan)
+    try:
+        inside = np.zeros(n, dtype=bool)
+        inside[parsed] = shapely.contains_xy(valid_perimeter, lons[parsed], lats[parsed])
+        dists[inside] = 0.0
+        outside = parsed & ~inside
+        if outside.any():
+            boundary = valid_perimeter.boundary
+            try:
+                shapely.prepare(boundary)
+            except Exception:
+                pass
+            pts = shapely.points(lons[outside], lats[outside])
+            lines = shapely.shortest_line(boundary, pts)
+            coords = shapely.get_coordinates(lines)
+            # shortest_line yields two-point lines; even rows are the
+            # boundary ends, odd rows the input points
+            try:
+                dists[outside] = _geodesic_km(
+                    lats[outside], lons[outside], coords[0::2, 1], coords[0::2, 0]
+                )
+            except Exception:
+                dists[outside] = _haversine_km_vec(
+                    lats[outside], lons[outside], coords[0::2, 1], coords[0::2, 0]
+                )
+    except Exception as e:
+        logger.debug(f"Vectorized distance computation failed, using per-record fallback: {e}")
+
     success_count = 0
     error_count = 0
     fallback_count = 0
     
-    for r in records:
-        try:
-            lat = float(r["latitude"])
-            lon = float(r["longitude"])
-            pt = Point(lon, lat)
-            
-            # Method 1: Try boundary distance first (most accurate)
+    for i, r in enumerate(records_list):
+        dist_km: Optional[float] = float(dists[i]) if np.isfinite(dists[i]) else None
+        if dist_km is None and parsed[i]:
+            # Per-record fallback chain for rows the batch could not resolve
+            pt = Point(lons[i], lats[i])
             dist_km = _calculate_distance_to_polygon(pt, valid_perimeter)
-            
-            # Method 2: Fallback to centroid distance
             if dist_km is None:
                 dist_km = _calculate_centroid_distance(pt, valid_perimeter)
                 fallback_count += 1
                 logger.debug(f"Used centroid fallback for {r.get('name', 'unknown')}")
-            
-            # Method 3: Last resort - bounding box distance
             if dist_km is None or dist_km == float('inf'):
                 dist_km = _calculate_bounding_box_distance(pt, valid_perimeter)
                 fallback_count += 1
                 logger.debug(f"Used bounding box fallback for {r.get('name', 'unknown')}")
-            
-            # Final validation
-            if dist_km is None or dist_km == float('inf'):
-                error_count += 1
-                logger.warning(f"All distance methods failed for {r.get('name', 'unknown')}")
-                r = {**r, "distance_km_to_perimeter": None, f"distance_km_to_{region_slug}": None}
-            else:
-                # Round to 3 decimal places
-                dist_km = round(dist_km, 3)
-                success_count += 1
-                r = {**r, "distance_km_to_perimeter": dist_km, f"distance_km_to_{region_slug}": dist_km}
-            
-        except Exception as e:
-            error_count += 1
-            logger.warning(f"Failed to calculate distance for {r.get('name', 'unknown')}: {e}")
-            r = {**r, "distance_km_to_perimeter": None, f"distance_km_to_{region_slug}": None}
         
-        updated.append(r)
+        if dist_km is None or dist_km == float('inf'):
+            error_count += 1
+            logger.warning(f"All distance methods failed for {r.get('name', 'unknown')}")
+            r["distance_km_to_perimeter"] = None
+            r[f"distance_km_to_{region_slug}"] = None
+        else:
+            # Round to 3 decimal places
+            dist_km = round(dist_km, 3)
+            success_count += 1
+            r["distance_km_to_perimeter"] = dist_km
+            r[f"distance_km_to_{region_slug}"] = dist_km
     
     logger.info(f"Distance calculation complete: {success_count} successful, {fallback_count} fallbacks, {error_count} errors")
-    return updated
+    return records_list
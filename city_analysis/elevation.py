@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import math
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import requests
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from .http_utils import build_session
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -17,22 +25,127 @@ class ElevationResult:
     cached: bool = False
 
 class ElevationService:
-    """Multi-source elevation data service with fallback logic."""
-    
-    def __init__(self, google_api_key: Optional[str] = None):
+    """Multi-source elevation data service with fallback logic.
+
+    Results are cached in memory and in a SQLite file under ``data/cache``,
+    keyed by coordinates rounded to 4 decimals (~11 m), so repeat runs skip
+    the network entirely for coordinates seen before.
+    """
+
+    _CACHE_DB = Path(__file__).parent.parent / "data" / "cache" / "elevations.sqlite"
+
+    def __init__(self, google_api_key: Optional[str] = None,
+                 cache_path: Optional[Path] = None):
         self.google_api_key = google_api_key
-        self.cache: Dict[Tuple[float, float], ElevationResult] = {}
+        self.cache: Dict[Tuple[int, int], ElevationResult] = {}
         self.request_counts = {"opentopo": 0, "google": 0, "open_elevation": 0}
-        
+        self.db: Optional[sqlite3.Connection] = None
+        try:
+            db_path = Path(cache_path) if cache_path is not None else self._CACHE_DB
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS elev("
+                "key TEXT PRIMARY KEY, elev REAL, source TEXT, conf REAL)"
+            )
+            self.db.commit()
+        except Exception as e:
+            logger.debug(f"Elevation disk cache unavailable: {e}")
+            self.db = None
+        # Pooled session: elevation lookups hammer the same few hosts, so
+        # keeping sockets alive avoids a TCP+TLS handshake per coordinate.
+        # requests speaks HTTP/1.1 only, so instead of HTTP/2 multiplexing
+        # we keep enough parallel keep-alive sockets per host to cover the
+        # threaded batch fetcher without evicting warm connections.
+        self.session = build_session(pool_connections=4, pool_maxsize=64)
+        # The session is safe for concurrent GETs, but the cache and the
+        # request counters are plain dicts and need a lock under threading.
+        self._lock = threading.Lock()
+        # Adaptive inter-source pause: stays at 0 while hosts are healthy,
+        # doubles when one signals overload (429/503), decays on success.
+        self._backoff = 0.0
+
+    @staticmethod
+    def _cache_key(lat: float, lon: float) -> Tuple[int, int]:
+        # Quantize to 1e-4 degrees (~11 m) with a plain multiply+truncate;
+        # integer pairs hash and compare cheaper than rounded float tuples.
+        return (int(lat * 10000.0), int(lon * 10000.0))
+
+    @staticmethod
+    def _db_key(lat: float, lon: float) -> str:
+        return f"{int(lat * 10000.0)}:{int(lon * 10000.0)}"
+
+    def _db_get(self, lat: float, lon: float) -> Optional[ElevationResult]:
+        """Look up a coordinate in the on-disk cache (caller holds the lock)."""
+        if self.db is None:
+            return None
+        try:
+            row = self.db.execute(
+                "SELECT elev, source, conf FROM elev WHERE key = ?",
+                (self._db_key(lat, lon),),
+            ).fetchone()
+        except Exception as e:
+            logger.debug(f"Elevation disk cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return ElevationResult(elevation=row[0], source=row[1], confidence=row[2], cached=True)
+
+    def _db_put_many(self, rows: List[Tuple[str, Optional[float], str, float]]) -> None:
+        """Persist fetched results in one transaction (caller holds the lock)."""
+        if self.db is None or not rows:
+            return
+        try:
+            self.db.executemany("INSERT OR REPLACE INTO elev VALUES (?, ?, ?, ?)", rows)
+            self.db.commit()
+        except Exception as e:
+            logger.debug(f"Elevation disk cache write failed: {e}")
+
+    def _note_failure(self, exc: Exception) -> None:
+        """Grow the backoff when a host explicitly asks us to slow down."""
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        if status in (429, 503):
+            with self._lock:
+                self._backoff = min(max(self._backoff * 2.0, 0.1), 5.0)
+
+    def _note_success(self) -> None:
+        """Decay the backoff toward zero once requests succeed again."""
+        if self._backoff:
+            with self._lock:
+                self._backoff = 0.0 if self._backoff < 0.1 else self._backoff / 2.0
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections and the cache database."""
+        self.session.close()
+        if self.db is not None:
+            try:
+                self.db.close()
+            except Exception:
+                pass
+            self.db = None
+
+    def __enter__(self) -> "ElevationService":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     def get_elevation(self, lat: float, lon: float, use_cache: bool = True) -> ElevationResult:
         """Get elevation for coordinates using multiple sources with fallback."""
-        cache_key = (round(lat, 4), round(lon, 4))
-        
+        cache_key = self._cache_key(lat, lon)
+
         if use_cache and cache_key in self.cache:
             result = self.cache[cache_key]
             result.cached = True
             return result
-        
+
+        if use_cache:
+            with self._lock:
+                result = self._db_get(lat, lon)
+            if result is not None:
+                self.cache[cache_key] = result
+                return result
+
         # Try sources in order of preference
         sources = [
             ("opentopo", self._try_opentopo),
@@ -46,8 +159,17 @@ class ElevationService:
                 if result.elevation is not None:
                     self.cache[cache_key] = result
                     self.request_counts[source_name] += 1
+                    with self._lock:
+                        self._db_put_many(
+                            [(self._db_key(lat, lon), result.elevation,
+                              result.source, result.confidence)]
+                        )
+                    self._note_success()
                     return result
-                time.sleep(0.1)  # Rate limiting
+                # Only pause before the next source if a host recently
+                # signalled overload; the common success path never sleeps.
+                if self._backoff:
+                    time.sleep(self._backoff)
             except Exception as e:
                 logger.debug(f"Elevation source {source_name} failed: {e}")
                 continue
@@ -63,7 +185,7 @@ class ElevationService:
         params = {"locations": f"{lat},{lon}"}
         
         try:
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self.session.get(url, params=params, timeout=10)
             resp.raise_for_status()
             data = resp.json()
             
@@ -77,6 +199,7 @@ class ElevationService:
                         confidence=0.9
                     )
         except Exception as e:
+            self._note_failure(e)
             logger.debug(f"OpenTopoData failed: {e}")
         
         return ElevationResult(elevation=None, source="opentopo", confidence=0.0)
@@ -93,7 +216,7 @@ class ElevationService:
         }
         
         try:
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self.session.get(url, params=params, timeout=10)
             resp.raise_for_status()
             data = resp.json()
             
@@ -107,6 +230,7 @@ class ElevationService:
                         confidence=0.95
                     )
         except Exception as e:
+            self._note_failure(e)
             logger.debug(f"Google Elevation API failed: {e}")
         
         return ElevationResult(elevation=None, source="google", confidence=0.0)
@@ -122,7 +246,7 @@ class ElevationService:
         for endpoint in endpoints:
             try:
                 params = {"locations": f"{lat},{lon}"}
-                resp = requests.get(endpoint, params=params, timeout=10)
+                resp = self.session.get(endpoint, params=params, timeout=10)
                 resp.raise_for_status()
                 data = resp.json()
                 
@@ -136,31 +260,140 @@ class ElevationService:
                             confidence=0.85
                         )
             except Exception as e:
+                self._note_failure(e)
                 logger.debug(f"Open-Elevation {endpoint} failed: {e}")
                 continue
         
         return ElevationResult(elevation=None, source="open_elevation", confidence=0.0)
     
+    def _batch_opentopo(self, coords: List[Tuple[float, float]]) -> List[Optional[float]]:
+        """Fetch a chunk of coordinates from OpenTopoData in one GET.
+
+        OpenTopoData accepts up to 100 "|"-separated locations per request,
+        so a chunk costs one HTTP round-trip instead of one per coordinate.
+        """
+        url = "https://api.opentopodata.org/v1/aster30m"
+        locations = "|".join(f"{lat},{lon}" for lat, lon in coords)
+        elevations: List[Optional[float]] = [None] * len(coords)
+        try:
+            resp = self.session.get(url, params={"locations": locations}, timeout=30)
+            resp.raise_for_status()
+            data = resp.json()
+            if data.get("status") == "OK" and data.get("results"):
+                for i, item in enumerate(data["results"][: len(coords)]):
+                    elevation = item.get("elevation")
+                    if elevation is not None:
+                        elevations[i] = float(elevation)
+        except Exception as e:
+            self._note_failure(e)
+            logger.debug(f"OpenTopoData batch failed: {e}")
+        return elevations
+
+    def _batch_open_elevation(self, coords: List[Tuple[float, float]]) -> List[Optional[float]]:
+        """Fetch a chunk of coordinates from Open-Elevation in one POST."""
+        endpoint = "https://api.open-elevation.com/api/v1/lookup"
+        payload = {"locations": [{"latitude": lat, "longitude": lon} for lat, lon in coords]}
+        elevations: List[Optional[float]] = [None] * len(coords)
+        try:
+            resp = self.session.post(endpoint, json=payload, timeout=30)
+            resp.raise_for_status()
+            data = resp.json()
+            if data.get("results"):
+                for i, item in enumerate(data["results"][: len(coords)]):
+                    elevation = item.get("elevation")
+                    if elevation is not None:
+                        elevations[i] = float(elevation)
+        except Exception as e:
+            self._note_failure(e)
+            logger.debug(f"Open-Elevation batch failed: {e}")
+        return elevations
+
+    def _fetch_chunk(self, chunk: List[Tuple[float, float]]) -> List[ElevationResult]:
+        """Resolve one chunk of coordinates, serving cached entries first.
+
+        Uncached coordinates go to the batch endpoints (OpenTopoData, then
+        Open-Elevation for whatever is still missing), with the per-coordinate
+        Google lookup as a last resort when an API key is configured.
+        """
+        results: List[Optional[ElevationResult]] = [None] * len(chunk)
+        to_fetch: List[int] = []
+        with self._lock:
+            for i, (lat, lon) in enumerate(chunk):
+                cache_key = self._cache_key(lat, lon)
+                cached = self.cache.get(cache_key)
+                if cached is None:
+                    cached = self._db_get(lat, lon)
+                    if cached is not None:
+                        self.cache[cache_key] = cached
+                if cached is not None:
+                    cached.cached = True
+                    results[i] = cached
+                else:
+                    to_fetch.append(i)
+
+        if to_fetch:
+            coords = [chunk[i] for i in to_fetch]
+            elevations = self._batch_opentopo(coords)
+            sources = ["opentopo"] * len(coords)
+            missing = [j for j, e in enumerate(elevations) if e is None]
+            if missing:
+                fallback = self._batch_open_elevation([coords[j] for j in missing])
+                for j, elevation in zip(missing, fallback):
+                    if elevation is not None:
+                        elevations[j] = elevation
+                        sources[j] = "open_elevation"
+            confidences = {"opentopo": 0.9, "google": 0.95, "open_elevation": 0.85}
+            rows: List[Tuple[str, Optional[float], str, float]] = []
+            for j, i in enumerate(to_fetch):
+                lat, lon = chunk[i]
+                elevation = elevations[j]
+                if elevation is not None:
+                    result = ElevationResult(
+                        elevation=elevation,
+                        source=sources[j],
+                        confidence=confidences[sources[j]],
+                    )
+                elif self.google_api_key:
+                    result = self._try_google(lat, lon)
+                else:
+                    result = ElevationResult(elevation=None, source="none", confidence=0.0)
+                with self._lock:
+                    if result.elevation is not None:
+                        self.request_counts[result.source] += 1
+                    self.cache[self._cache_key(lat, lon)] = result
+                if result.elevation is not None:
+                    # Failed lookups stay out of the disk cache so a later
+                    # run can retry them against healthier endpoints.
+                    rows.append((self._db_key(lat, lon), result.elevation,
+                                 result.source, result.confidence))
+                results[i] = result
+            with self._lock:
+                self._db_put_many(rows)
+
+        return results  # type: ignore[return-value]
+
     def get_elevation_batch(self, coordinates: List[Tuple[float, float]], 
-                           batch_size: int = 100) -> List[ElevationResult]:
-        """Get elevation for multiple coordinates with batching."""
-        results = []
-        
-        for i in range(0, len(coordinates), batch_size):
-            batch = coordinates[i:i + batch_size]
-            batch_results = []
-            
-            for lat, lon in batch:
-                result = self.get_elevation(lat, lon)
-                batch_results.append(result)
-                time.sleep(0.1)  # Rate limiting between requests
-            
-            results.extend(batch_results)
-            
-            # Progress logging
-            if len(coordinates) > batch_size:
-                logger.info(f"Processed elevation batch {i//batch_size + 1}/{(len(coordinates) + batch_size - 1)//batch_size}")
-        
+                           batch_size: int = 100,
+                           max_workers: int = 8) -> List[ElevationResult]:
+        """Get elevation for multiple coordinates with batched requests.
+
+        ``max_workers`` bounds how many chunk requests are in flight at
+        once; the pooled session multiplexes them over live connections.
+        """
+        batch_size = min(batch_size, 100)  # OpenTopoData cap per request
+        chunks = [coordinates[i:i + batch_size] for i in range(0, len(coordinates), batch_size)]
+        if not chunks:
+            return []
+        if len(chunks) == 1:
+            return self._fetch_chunk(chunks[0])
+
+        # Chunks are independent HTTP round-trips, so overlap them; the
+        # session's Retry policy backs off if a host starts returning 429.
+        results: List[ElevationResult] = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as ex:
+            for done, chunk_results in enumerate(ex.map(self._fetch_chunk, chunks), start=1):
+                results.extend(chunk_results)
+                logger.info(f"Processed elevation batch {done}/{len(chunks)}")
         return results
     
     def get_stats(self) -> Dict[str, int]:
@@ -174,18 +407,21 @@ class ElevationService:
 
 def enrich_places_with_elevation(places: List[Dict], 
                                 google_api_key: Optional[str] = None,
-                                batch_size: int = 100) -> List[Dict]:
+                                batch_size: int = 100,
+                                max_workers: int = 8) -> List[Dict]:
     """Enrich place records with elevation data from multiple sources."""
     if not places:
         return places
     
-    service = ElevationService(google_api_key=google_api_key)
-    
     # Extract coordinates for batch processing
     coordinates = [(float(p["latitude"]), float(p["longitude"])) for p in places]
-    
+
     logger.info(f"Fetching elevation data for {len(places)} places...")
-    elevation_results = service.get_elevation_batch(coordinates, batch_size=batch_size)
+    with ElevationService(google_api_key=google_api_key) as service:
+        elevation_results = service.get_elevation_batch(
+            coordinates, batch_size=batch_size, max_workers=max_workers
+        )
+        stats = service.get_stats()
     
     # Merge elevation data back into place records
     enriched_places = []
@@ -197,18 +433,23 @@ def enrich_places_with_elevation(places: List[Dict],
             enriched_place["elevation"] = elevation_result.elevation
             enriched_place["elevation_source"] = elevation_result.source
             enriched_place["elevation_confidence"] = elevation_result.confidence
-        
-        # Add elevation in feet if we have elevation data (from any source)
-        if enriched_place.get("elevation") is not None:
-            # Convert meters to feet (1 meter = 3.28084 feet)
-            elevation_meters = enriched_place["elevation"]
-            elevation_feet = round(elevation_meters * 3.28084, 1)
-            enriched_place["elevation_feet"] = elevation_feet
-        
+
         enriched_places.append(enriched_place)
+
+    # Convert meters to feet (1 meter = 3.28084 feet) in one NumPy pass
+    # instead of a Python multiply+round per record; NaN marks records
+    # without elevation from any source.
+    meters = np.fromiter(
+        (p["elevation"] if p.get("elevation") is not None else np.nan for p in enriched_places),
+        dtype=np.float64,
+        count=len(enriched_places),
+    )
+    feet = np.round(meters * 3.28084, 1)
+    for p, ft in zip(enriched_places, feet.tolist()):
+        if not math.isnan(ft):
+            p["elevation_feet"] = ft
     
     # Log statistics
-    stats = service.get_stats()
     logger.info(f"Elevation enrichment complete. Stats: {stats}")
     
     return enriched_places
@@ -1,25 +1,37 @@
 from __future__ import annotations
 
+import functools
 import json
+import os
 from pathlib import Path
 from typing import Tuple
 
+import numpy as np
+import shapely
+
 from shapely.geometry import Polygon, MultiPolygon, shape, box, Point
 from shapely.ops import unary_union
+from shapely.prepared import PreparedGeometry, prep
 
+try:  # Optional fast path for coordinate-heavy GeoJSON
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
-def load_perimeter(perimeter_path: str | Path) -> MultiPolygon | Polygon:
-    """Load a perimeter polygon/multipolygon from a GeoJSON file.
 
-    Args:
-        perimeter_path: Path to a GeoJSON file containing a Polygon or MultiPolygon.
+@functools.lru_cache(maxsize=32)
+def _load_perimeter_cached(abspath: str, mtime: float) -> MultiPolygon | Polygon:
+    """Parse and build the perimeter geometry; memoized on (path, mtime).
 
-    Returns:
-        A Shapely Polygon or MultiPolygon in WGS84.
+    Parsing a multi-megabyte GeoJSON and building the shapely geometry is
+    the expensive part of load_perimeter; keying on mtime keeps the cache
+    correct if the file is regenerated mid-session.
     """
-    path = Path(perimeter_path)
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        data = orjson.loads(Path(abspath).read_bytes())
+    else:
+        with open(abspath, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     # Accept FeatureCollection, Feature, or raw geometry
     if data.get("type") == "FeatureCollection":
@@ -32,6 +44,22 @@ def load_perimeter(perimeter_path: str | Path) -> MultiPolygon | Polygon:
     return shape(data)  # type: ignore[arg-type]
 
 
+def load_perimeter(perimeter_path: str | Path) -> MultiPolygon | Polygon:
+    """Load a perimeter polygon/multipolygon from a GeoJSON file.
+
+    Repeated loads of the same (unmodified) file are served from an
+    in-process cache.
+
+    Args:
+        perimeter_path: Path to a GeoJSON file containing a Polygon or MultiPolygon.
+
+    Returns:
+        A Shapely Polygon or MultiPolygon in WGS84.
+    """
+    abspath = str(Path(perimeter_path).resolve())
+    return _load_perimeter_cached(abspath, os.path.getmtime(abspath))
+
+
 def default_alps_polygon() -> Polygon | MultiPolygon:
     """Return a geographically accurate default polygon for the Alps.
     
@@ -71,6 +99,26 @@ def default_alps_polygon() -> Polygon | MultiPolygon:
     return box(6.0, 45.5, 16.0, 48.0)
 
 
+def default_alps_polygon_prepared() -> Tuple[Polygon | MultiPolygon, PreparedGeometry]:
+    """Return the default Alps polygon along with a prepared twin.
+
+    The prepared geometry indexes the polygon boundary once, so repeated
+    per-point ``prepared.contains(Point(lon, lat))`` tests run against the
+    index instead of the full vertex list.
+    """
+    p = default_alps_polygon()
+    return p, prep(p)
+
+
+def contains_points(poly: Polygon | MultiPolygon, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Vectorized point-in-polygon test over coordinate arrays.
+
+    shapely.contains_xy evaluates the whole batch in C against x/y arrays
+    without materializing a Point object per coordinate.
+    """
+    return shapely.contains_xy(poly, lons, lats)
+
+
 def polygon_bounds(p: Polygon | MultiPolygon) -> Tuple[float, float, float, float]:
     """Return (south, west, north, east) bounding box for Overpass queries.
 
@@ -1,15 +1,151 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import json
+import os
 import time
-from typing import Dict, Iterable, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
 
-import requests
+from .http_utils import build_session
+from .ratelimit import RateLimiter
+
+try:  # Optional fast path for 1000-record JSON pages
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 GEONAMES_ENDPOINT = "http://api.geonames.org/searchJSON"
 DEFAULT_HEADERS = {
     "User-Agent": "city-analysis/0.1 (+contact: your-email@example.com)",
 }
 
+# One pooled session for all paginated calls: every request hits the same
+# GeoNames host, so keep-alive saves a DNS lookup plus TCP handshake per page.
+_SESSION = build_session(pool_connections=4, pool_maxsize=10)
+_SESSION.headers.update(DEFAULT_HEADERS)
+
+_CACHE_DIR = Path.home() / ".cache" / "city_analysis" / "geonames"
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _cached_page(params: Dict) -> Dict:
+    """Fetch one GeoNames page through a gzipped JSON disk cache.
+
+    Pages are keyed by a hash of the full query parameters and expire
+    after 7 days; set GEONAMES_CACHE_FORCE_REFRESH=1 to bypass reads.
+    Responses without results are never cached so transient failures and
+    empty pages can be retried on the next run.
+    """
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+    path = _CACHE_DIR / f"{key}.json.gz"
+    force = os.environ.get("GEONAMES_CACHE_FORCE_REFRESH", "") not in ("", "0")
+    if not force:
+        try:
+            if path.exists() and (time.time() - path.stat().st_mtime) < _CACHE_TTL_SECONDS:
+                with gzip.open(path, "rb") as f:
+                    raw = f.read()
+                return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:
+            pass  # unreadable cache entry; refetch below
+
+    resp = _SESSION.get(GEONAMES_ENDPOINT, params=params, timeout=30)
+    resp.raise_for_status()
+    if orjson is not None:
+        # orjson decodes the raw UTF-8 bytes directly, skipping requests'
+        # charset detection.
+        payload = orjson.loads(resp.content)
+    else:
+        resp.encoding = 'utf-8'  # Ensure proper UTF-8 encoding
+        payload = resp.json()
+    if payload.get("geonames"):
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = _CACHE_DIR / f"{key}.tmp"
+            with gzip.open(tmp, "wb") as f:
+                f.write(json.dumps(payload).encode("utf-8"))
+            os.replace(tmp, path)
+        except Exception:
+            pass  # cache writes are best-effort
+    return payload
+
+
+def _normalize(item: Dict) -> Dict | None:
+    """Turn one raw GeoNames item into a place record, or None to skip it.
+
+    Top-level so the pagination loop can run it via map() with the
+    try/except confined to the numeric casts.
+    """
+    get = item.get
+    name = get("name") or get("toponymName")
+    country_code = get("countryCode")
+    if not name or not country_code:
+        return None
+    try:
+        lat = float(get("lat"))
+        lng = float(get("lng"))
+        population = int(get("population") or 0)
+    except (TypeError, ValueError):
+        return None
+    elevation = get("elevation")
+    if elevation is not None:
+        try:
+            elevation = float(elevation)
+        except (TypeError, ValueError):
+            elevation = None
+    return {
+        "name": name,
+        "country": country_code,
+        "latitude": lat,
+        "longitude": lng,
+        "population": population,
+        "elevation": elevation,
+        "source": "geonames",
+    }
+
+
+def _fetch_country(
+    country: str,
+    min_population: int,
+    username: str,
+    max_rows: int,
+    limiter: RateLimiter | None,
+) -> List[Dict]:
+    """Paginate one country's GeoNames results on the shared session.
+
+    Pagination stays serial within a country (startRow depends on the
+    previous page); countries are fetched concurrently by the caller.
+    """
+    combined: List[Dict] = []
+    start_row = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        params = {
+            "featureClass": "P",
+            "country": country,
+            "orderby": "population",
+            "maxRows": max_rows,
+            "startRow": start_row,
+            "username": username,
+            "minPopulation": min_population,
+        }
+        payload = _cached_page(params)
+        total = int(payload.get("totalResultsCount", 0))
+        geonames = payload.get("geonames", [])
+
+        # Malformed entries normalize to None and are dropped; building the
+        # page list first lets extend() grow `combined` in one realloc.
+        page = [r for r in map(_normalize, geonames) if r is not None]
+        combined.extend(page)
+
+        start_row += max_rows
+        if start_row >= total or not geonames:
+            break
+    return combined
+
 
 def fetch_geonames_cities(
     countries: Iterable[str],
@@ -17,77 +153,59 @@ def fetch_geonames_cities(
     username: str,
     max_rows: int = 1000,
     request_pause_seconds: float = 1.0,
-) -> List[Dict]:
+    workers: int = 4,
+) -> Iterator[Dict]:
     """Fetch cities from GeoNames for specified countries and minimum population.
 
     This uses the searchJSON endpoint for featureClass=P (populated places) and
-    orders by population. It paginates through results.
+    orders by population. It paginates through results, fetching countries
+    concurrently on the shared pooled session and yielding records as each
+    country completes, so downstream filtering can overlap the remaining
+    fetches. Use fetch_geonames_cities_list for a materialized list.
 
     Args:
         countries: ISO 3166-1 alpha-2 codes to query, e.g. ["AT", "CH", ...].
         min_population: Minimum population threshold to apply server-side.
         username: GeoNames username (register at geonames.org).
         max_rows: Page size per request (GeoNames max is 1000).
-        request_pause_seconds: Throttle between requests to be polite.
+        request_pause_seconds: Average pause between requests across all
+            countries (enforced by a shared token-bucket limiter).
+        workers: Maximum countries fetched in parallel.
 
-    Returns:
-        List of place dicts with keys: name, country, latitude, longitude, population, source
+    Yields:
+        Place dicts with keys: name, country, latitude, longitude, population, source
     """
-    combined: List[Dict] = []
-    for country in countries:
-        start_row = 0
-        while True:
-            params = {
-                "featureClass": "P",
-                "country": country,
-                "orderby": "population",
-                "maxRows": max_rows,
-                "startRow": start_row,
-                "username": username,
-                "minPopulation": min_population,
-            }
-            resp = requests.get(GEONAMES_ENDPOINT, params=params, headers=DEFAULT_HEADERS, timeout=30)
-            resp.raise_for_status()
-            # Ensure proper UTF-8 encoding
-            resp.encoding = 'utf-8'
-            payload = resp.json()
-            total = int(payload.get("totalResultsCount", 0))
-            geonames = payload.get("geonames", [])
-
-            for item in geonames:
-                try:
-                    name = item.get("name") or item.get("toponymName")
-                    country_code = item.get("countryCode")
-                    lat = float(item.get("lat"))
-                    lng = float(item.get("lng"))
-                    population = int(item.get("population") or 0)
-                    # Extract elevation if available
-                    elevation = item.get("elevation")
-                    if elevation is not None:
-                        try:
-                            elevation = float(elevation)
-                        except (ValueError, TypeError):
-                            elevation = None
-                    
-                    if not name or not country_code:
-                        continue
-                    combined.append(
-                        {
-                            "name": name,
-                            "country": country_code,
-                            "latitude": lat,
-                            "longitude": lng,
-                            "population": population,
-                            "elevation": elevation,
-                            "source": "geonames",
-                        }
-                    )
-                except Exception:
-                    # Skip malformed entries gracefully
-                    continue
-
-            start_row += max_rows
-            if start_row >= total or not geonames:
-                break
-            time.sleep(request_pause_seconds)
-    return combined
+    country_list = [c for c in countries]
+    if not country_list:
+        return
+    # One bucket shared across the country threads keeps the aggregate rate
+    # polite without padding fast requests with fixed sleeps.
+    limiter = RateLimiter(1.0 / request_pause_seconds) if request_pause_seconds > 0 else None
+    with ThreadPoolExecutor(max_workers=min(workers, len(country_list))) as ex:
+        futures = [
+            ex.submit(_fetch_country, c, min_population, username, max_rows, limiter)
+            for c in country_list
+        ]
+        for f in as_completed(futures):
+            yield from f.result()
+
+
+def fetch_geonames_cities_list(
+    countries: Iterable[str],
+    min_population: int,
+    username: str,
+    max_rows: int = 1000,
+    request_pause_seconds: float = 1.0,
+    workers: int = 4,
+) -> List[Dict]:
+    """Materialized convenience wrapper around fetch_geonames_cities."""
+    return list(
+        fetch_geonames_cities(
+            countries=countries,
+            min_population=min_population,
+            username=username,
+            max_rows=max_rows,
+            request_pause_seconds=request_pause_seconds,
+            workers=workers,
+        )
+    )
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import random
 import re
 import time
+from collections.abc import Sized
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 from openai import OpenAI
+
+try:  # Optional fast path for parsing LLM JSON replies
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 from tqdm import tqdm
 from math import radians, sin, cos, asin, sqrt
 from .geometry import default_alps_polygon, polygon_bounds
 from typing import Optional
-from .airport_check import _osrm_route, DriveResult
+from .airport_check import _client, _osrm_route, DriveResult
 from .overpass import fetch_overpass_hospitals_bbox_tiled
+from .ratelimit import RateLimiter, RequestTokenLimiter
+
+
+# Compiled once: _extract_first_json runs on every non-structured response.
+_FENCED_JSON_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+_BRACE_RE = re.compile(r"\{.*\}", re.DOTALL)
 
 
 @dataclass
@@ -26,20 +42,20 @@ class HospitalCheckResult:
 
 def _extract_first_json(text: str) -> Optional[Dict]:
     """Best-effort extraction of the first JSON object from a text blob."""
-    if not text:
+    if not text or "{" not in text:
         return None
     # Try fenced JSON first
-    fenced = re.findall(r"```json\s*(\{[\s\S]*?\})\s*```", text)
+    fenced = _FENCED_JSON_RE.findall(text)
     candidates: List[str] = []
     if fenced:
         candidates.extend(fenced)
     # Fallback: first top-level {...}
-    braces = re.findall(r"\{[\s\S]*\}", text)
+    braces = _BRACE_RE.findall(text)
     if braces:
         candidates.append(braces[0])
     for cand in candidates:
         try:
-            return json.loads(cand)
+            return orjson.loads(cand) if orjson is not None else json.loads(cand)
         except Exception:
             continue
     return None
@@ -54,9 +70,14 @@ def _coerce_result(payload: Dict) -> HospitalCheckResult:
             return v
         return None
 
-    hospital_in_city = norm_yes_no(payload.get("hospital_in_city"))
-    # Accept either integer or float; clamp to [0,100]
-    conf_raw = payload.get("confidence_pct") or payload.get("hospital_confidence_pct")
+    get = payload.get
+    hospital_in_city = norm_yes_no(get("hospital_in_city"))
+    # Accept either integer or float; clamp to [0,100]. The fallback key is
+    # only consulted when the primary is absent, so a legitimate 0 value
+    # is kept rather than discarded as falsy.
+    conf_raw = get("confidence_pct")
+    if conf_raw is None:
+        conf_raw = get("hospital_confidence_pct")
     confidence: Optional[int] = None
     if conf_raw is not None:
         try:
@@ -66,8 +87,13 @@ def _coerce_result(payload: Dict) -> HospitalCheckResult:
             confidence = None
 
     # Reasoning and sources
-    reasoning = payload.get("reasoning") or payload.get("hospital_reasoning")
-    sources = payload.get("sources") or payload.get("urls") or []
+    reasoning = get("reasoning")
+    if reasoning is None:
+        reasoning = get("hospital_reasoning")
+    sources = get("sources")
+    if sources is None:
+        sources = get("urls")
+    sources = sources or []
     if isinstance(sources, list) and sources:
         # Append up to 3 URLs into the reasoning for convenience
         links = ", ".join([str(u) for u in sources[:3]])
@@ -84,36 +110,143 @@ def _coerce_result(payload: Dict) -> HospitalCheckResult:
     )
 
 
-def _build_prompt(city: str, country: str) -> str:
-    return (
-        "You are a rigorous web research assistant. Use the web_search tool to search the web, "
-        "then answer strictly based on reputable sources (official hospital/health system sites, "
-        "government or public health portals, national healthcare directories, or Wikipedia only if it cites official sources).\n\n"
-        f"Question: Is there at least one hospital located within the city limits of {city}, {country}?\n"
-        "- If unsure because sources conflict or are unclear, answer 'no' with lower confidence.\n"
-        "- Provide 1-2 sentence reasoning and include 1-3 relevant URLs.\n\n"
-        "Return JSON ONLY with this exact schema and field names:\n"
-        "{\n"
-        "  \"hospital_in_city\": \"yes\" | \"no\",\n"
-        "  \"confidence_pct\": number (0-100),\n"
-        "  \"reasoning\": string,\n"
-        "  \"sources\": [string URL, ...]\n"
-        "}"
-    )
+_CACHE_DIR = os.path.expanduser("~/.cache/city_analysis/hospital")
+_CACHE_TTL_SECONDS = 30 * 86400
 
 
-def _query_openai_with_web_search(client: OpenAI, model: str, city: str, country: str, request_timeout: Optional[float] = 60.0) -> HospitalCheckResult:
+def _hospital_cache_path(model: str, city: str, country: str) -> str:
+    key = hashlib.sha256(f"{model}|{city.lower()}|{country.lower()}".encode("utf-8")).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{key}.json")
+
+
+def _hospital_cache_get(model: str, city: str, country: str) -> Optional[HospitalCheckResult]:
+    """Return a previously stored result for this (model, city, country), if fresh."""
+    if os.getenv("HOSPITAL_CACHE_FORCE_REFRESH"):
+        return None
+    path = _hospital_cache_path(model, city, country)
     try:
-        prompt = _build_prompt(city, country)
-        # Use Responses API with web_search tool. Fallbacks are handled below.
-        response = client.responses.create(
-            model=model,
-            input=(
-                "System: Follow instructions exactly. Do not fabricate sources. Return ONLY JSON.\n\n" + prompt
-            ),
-            tools=[{"type": "web_search"}],
-            timeout=request_timeout,
+        if time.time() - os.path.getmtime(path) > _CACHE_TTL_SECONDS:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        return HospitalCheckResult(
+            hospital_in_city=payload.get("hospital_in_city"),
+            hospital_confidence_pct=payload.get("hospital_confidence_pct"),
+            hospital_reasoning=payload.get("hospital_reasoning"),
+            hospital_error=None,
         )
+    except Exception:
+        return None
+
+
+def _hospital_cache_put(model: str, city: str, country: str, result: HospitalCheckResult) -> None:
+    """Persist a successful result; errored results are never cached."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        path = _hospital_cache_path(model, city, country)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "hospital_in_city": result.hospital_in_city,
+                    "hospital_confidence_pct": result.hospital_confidence_pct,
+                    "hospital_reasoning": result.hospital_reasoning,
+                },
+                f,
+            )
+        os.replace(tmp, path)
+    except Exception:
+        pass  # cache writes are best-effort
+
+
+# Static instruction block, identical for every city: keeping it byte-stable
+# as the instructions= prefix lets the provider prompt-cache it across all
+# records, so only the short per-city input is uncached.
+_SYSTEM_PROMPT = (
+    "Follow instructions exactly. Do not fabricate sources. Return ONLY JSON.\n\n"
+    "You are a rigorous web research assistant. Use the web_search tool to search the web, "
+    "then answer strictly based on reputable sources (official hospital/health system sites, "
+    "government or public health portals, national healthcare directories, or Wikipedia only if it cites official sources).\n\n"
+    "Question: Is there at least one hospital located within the city limits of the given city?\n"
+    "- If unsure because sources conflict or are unclear, answer 'no' with lower confidence.\n"
+    "- Provide 1-2 sentence reasoning and include 1-3 relevant URLs.\n\n"
+    "Return JSON ONLY with this exact schema and field names:\n"
+    "{\n"
+    "  \"hospital_in_city\": \"yes\" | \"no\",\n"
+    "  \"confidence_pct\": number (0-100),\n"
+    "  \"reasoning\": string,\n"
+    "  \"sources\": [string URL, ...]\n"
+    "}"
+)
+
+
+def _query_openai_with_web_search(client: OpenAI, model: str, city: str, country: str, request_timeout: Optional[float] = 60.0) -> HospitalCheckResult:
+    """Answer the hospital question for one city, via the on-disk cache.
+
+    A paid multi-second LLM+web-search call becomes a local file read on
+    repeat runs; only successful results are stored (30-day TTL).
+    """
+    cached = _hospital_cache_get(model, city, country)
+    if cached is not None:
+        return cached
+    result = _query_openai_with_web_search_uncached(client, model, city, country, request_timeout)
+    if not result.hospital_error:
+        _hospital_cache_put(model, city, country, result)
+    return result
+
+
+# Structured-output contract: the model must return exactly this object, so
+# no prose surrounds the JSON and the regex extraction below becomes a
+# legacy fallback.
+_RESPONSE_TEXT_FORMAT = {
+    "format": {
+        "type": "json_schema",
+        "name": "hospital_check",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "hospital_in_city": {"type": "string", "enum": ["yes", "no"]},
+                "confidence_pct": {"type": "integer", "minimum": 0, "maximum": 100},
+                "reasoning": {"type": "string"},
+                "sources": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["hospital_in_city", "confidence_pct", "reasoning", "sources"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    }
+}
+
+
+def _query_openai_with_web_search_uncached(client: OpenAI, model: str, city: str, country: str, request_timeout: Optional[float] = 60.0) -> HospitalCheckResult:
+    try:
+        # Use Responses API with web_search tool and a strict JSON schema so
+        # the reply is guaranteed-valid JSON. The static instructions carry
+        # everything city-independent (prompt-cacheable); the input is just
+        # the city. Fallbacks are handled below.
+        try:
+            response = client.responses.create(
+                model=model,
+                instructions=_SYSTEM_PROMPT,
+                input=f"City: {city}, Country: {country}",
+                tools=[{"type": "web_search"}],
+                text=_RESPONSE_TEXT_FORMAT,
+                timeout=request_timeout,
+            )
+        except TypeError:
+            # Older SDKs without the text= structured-output parameter
+            response = client.responses.create(
+                model=model,
+                instructions=_SYSTEM_PROMPT,
+                input=f"City: {city}, Country: {country}",
+                tools=[{"type": "web_search"}],
+                timeout=request_timeout,
+            )
+
+        # Structured output parsed by the SDK
+        parsed_output = getattr(response, "output_parsed", None)
+        if isinstance(parsed_output, dict):
+            return _coerce_result(parsed_output)
 
         # Try structured content first (json_schema response)
         try:
@@ -177,52 +310,153 @@ def enrich_records_with_hospital_presence(
     model: str = "gpt-5",
     request_timeout: Optional[float] = 60.0,
     sleep_seconds_between_requests: float = 0.5,
-) -> List[Dict]:
+    max_concurrency: int = 8,
+    population_threshold: int = 50000,
+    max_requests_per_minute: Optional[float] = None,
+    max_tokens_per_minute: Optional[float] = None,
+) -> Tuple[List[Dict], bool]:
     """
     For each record, query OpenAI with web search to determine if the city has at least one hospital.
-    Returns a new list of records with additional columns:
+    Records at or above population_threshold are answered by a population
+    prior (cities that size essentially always have a hospital) without an
+    API call; set the threshold to 0 to disable the shortcut. Remaining
+    queries are dispatched concurrently (bounded by max_concurrency) since
+    each one is pure remote-LLM wait. When max_requests_per_minute and/or
+    max_tokens_per_minute are set, a dual request/token bucket paces
+    dispatch proactively at the account limits and replaces the fixed
+    inter-request sleep; rate-limited calls retry with jittered
+    exponential backoff.
+    Returns (records, changed) where records carry additional columns
+    (records are mutated in place rather than copied):
       - hospital_in_city: "yes" | "no" (blank if error)
       - hospital_confidence_pct: integer 0-100 (blank if error)
       - hospital_reasoning: brief reasoning with links (blank if error)
       - hospital_error: error message if any API/parsing error
+    and changed is False when every record already carried identical values,
+    letting callers skip re-serializing unchanged outputs.
     """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    enriched: List[Dict] = []
-
-    for r in tqdm(list(records), desc="Checking hospitals", unit="city"):
+    client = _client()
+
+    # Deduplication and ordered reassembly below need random access, so only
+    # copy when the caller handed us a lazy iterable.
+    records_list = records if isinstance(records, list) else list(records)
+    if not records_list:
+        return [], False
+
+    results: List[Optional[HospitalCheckResult]] = [None] * len(records_list)
+
+    # Free O(1) prior first: big cities virtually always have a hospital,
+    # so only borderline records pay for an LLM+web-search call.
+    shortcut_count = 0
+    if population_threshold > 0:
+        prior = HospitalCheckResult(
+            hospital_in_city="yes",
+            hospital_confidence_pct=95,
+            hospital_reasoning=f"population-based prior (>={population_threshold})",
+            hospital_error=None,
+        )
+        for i, r in enumerate(records_list):
+            try:
+                population = int(r.get("population") or 0)
+            except (TypeError, ValueError):
+                population = 0
+            if population >= population_threshold:
+                results[i] = prior
+                shortcut_count += 1
+
+    # One query per distinct (city, country): records duplicated across
+    # sources share the same prompt and therefore the same answer, so the
+    # result fans back out to every record in the bucket.
+    buckets: Dict[Tuple[str, str], Tuple[str, str, List[int]]] = {}
+    for i, r in enumerate(records_list):
+        if results[i] is not None:
+            continue
         city = str(r.get("name") or r.get("city") or "").strip()
         country = str(r.get("country") or "").strip()
+        key = (city.lower(), country.lower())
+        if key in buckets:
+            buckets[key][2].append(i)
+        else:
+            buckets[key] = (city, country, [i])
 
-        result = _query_openai_with_web_search(
-            client=client,
-            model=model,
-            city=city,
-            country=country,
-            request_timeout=request_timeout,
+    if shortcut_count:
+        print(
+            f"Hospital check: {shortcut_count} records answered by population prior; "
+            f"{len(buckets)} LLM queries remain"
         )
 
-        new_record = dict(r)
+    # Proactive RPM/TPM budget when account limits are given; otherwise the
+    # plain token bucket keeps the average request rate of the old sleep.
+    minute_limiter: Optional[RequestTokenLimiter] = None
+    if max_requests_per_minute is not None or max_tokens_per_minute is not None:
+        minute_limiter = RequestTokenLimiter(
+            max_requests_per_minute if max_requests_per_minute is not None else float("inf"),
+            max_tokens_per_minute if max_tokens_per_minute is not None else float("inf"),
+        )
+    limiter = (
+        RateLimiter(1.0 / sleep_seconds_between_requests, burst=max_concurrency)
+        if minute_limiter is None and sleep_seconds_between_requests > 0
+        else None
+    )
+
+    def _one(key: Tuple[str, str]) -> Tuple[Tuple[str, str], HospitalCheckResult]:
+        city, country, _ = buckets[key]
+        # Rough 4-chars-per-token estimate over the static prefix + input.
+        est_tokens = (len(_SYSTEM_PROMPT) + len(city) + len(country) + 32) // 4
+        result: HospitalCheckResult
+        for attempt in range(5):
+            if minute_limiter is not None:
+                minute_limiter.acquire(est_tokens)
+            elif limiter is not None:
+                limiter.acquire()
+            result = _query_openai_with_web_search(
+                client=client,
+                model=model,
+                city=city,
+                country=country,
+                request_timeout=request_timeout,
+            )
+            err = (result.hospital_error or "").lower()
+            if "429" not in err and "rate limit" not in err:
+                break
+            # Exponential backoff with jitter before retrying a 429
+            time.sleep(min(60.0, float(2 ** attempt)) * (1.0 + random.random()))
+        return key, result
+
+    if buckets:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(buckets))) as ex:
+            futures = [ex.submit(_one, k) for k in buckets]
+            for f in tqdm(as_completed(futures), total=len(futures), desc="Checking hospitals", unit="city"):
+                key, result = f.result()
+                for i in buckets[key][2]:
+                    results[i] = result
+
+    changed = False
+
+    for r, result in zip(records_list, results):
         if result.hospital_error:
-            new_record["hospital_in_city"] = ""
-            new_record["hospital_confidence_pct"] = ""
-            new_record["hospital_reasoning"] = ""
-            new_record["hospital_error"] = result.hospital_error
+            updates = {
+                "hospital_in_city": "",
+                "hospital_confidence_pct": "",
+                "hospital_reasoning": "",
+                "hospital_error": result.hospital_error,
+            }
         else:
-            new_record["hospital_in_city"] = result.hospital_in_city or ""
-            new_record["hospital_confidence_pct"] = (
-                result.hospital_confidence_pct if result.hospital_confidence_pct is not None else ""
-            )
-            new_record["hospital_reasoning"] = result.hospital_reasoning or ""
-            new_record["hospital_error"] = ""
-
-        enriched.append(new_record)
-
-        # Gentle pacing to avoid hammering the API
-        if sleep_seconds_between_requests > 0:
-            time.sleep(sleep_seconds_between_requests)
+            updates = {
+                "hospital_in_city": result.hospital_in_city or "",
+                "hospital_confidence_pct": (
+                    result.hospital_confidence_pct if result.hospital_confidence_pct is not None else ""
+                ),
+                "hospital_reasoning": result.hospital_reasoning or "",
+                "hospital_error": "",
+            }
+        if not changed and any(r.get(k) != v for k, v in updates.items()):
+            changed = True
+        # Mutate in place: callers treat the returned list as the new truth,
+        # so copying every record first was pure allocation overhead.
+        r.update(updates)
 
-    return enriched
+    return records_list, changed
 
 
 
@@ -270,12 +504,16 @@ def enrich_records_with_hospital_presence_osm(
     cache_dir: Optional[str] = None,
     region_slug: Optional[str] = None,
     resume: bool = False,
-) -> List[Dict]:
+    osrm_max_workers: int = 8,
+) -> Tuple[List[Dict], bool]:
     """Determine hospital presence using OSM hospitals within a radius around city centroid.
 
     - If any OSM hospital lies within radius_km of a city's (lat,lon), mark yes; else no.
     - If fallback_to_openai is True, call the OpenAI web search method only for cities
       where OSM found none, to potentially flip "no" to "yes" with reasoning.
+
+    Returns (records, changed); changed is False when no record gained a new
+    column or value, so callers can skip rewriting unchanged CSVs.
     """
     # Determine bbox to query for hospitals
     if perimeter_bbox is None:
@@ -300,12 +538,37 @@ def enrich_records_with_hospital_presence_osm(
     # Precompute for quick coarse filter
     deg_radius = max(0.001, radius_km / 111.0)  # ~1 deg ~111 km
 
+    # Hospital coordinates as arrays built once (NaN for unparsable rows);
+    # each city then runs a vectorized haversine over a coarse-masked slice
+    # instead of a Python loop over every hospital.
+    n_hosp = len(hospitals)
+    hlat = np.full(n_hosp, np.nan)
+    hlon = np.full(n_hosp, np.nan)
+    for i, h in enumerate(hospitals):
+        try:
+            hlat[i] = float(h.get("latitude"))
+            hlon[i] = float(h.get("longitude"))
+        except (TypeError, ValueError):
+            pass
+    hlat_rad = np.radians(hlat)
+    hlon_rad = np.radians(hlon)
+    cos_hlat = np.cos(hlat_rad)
+
+    # Sort by latitude so the coarse window becomes a binary-searched band
+    # (O(log H) per city) rather than a full-array comparison. NaN rows
+    # sort to the end, outside any finite band.
+    lat_order = np.argsort(hlat)
+    hlat_sorted = hlat[lat_order]
+
     enriched: List[Dict] = []
+    source_records: List[Dict] = []
+    osrm_pending: List[Tuple[int, float, float, float, float]] = []
     client: Optional[OpenAI] = None
     if fallback_to_openai:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = _client()
 
-    for r in tqdm(list(records), desc="Checking hospitals (OSM)", unit="city"):
+    total = len(records) if isinstance(records, Sized) else None
+    for r in tqdm(records, desc="Checking hospitals (OSM)", total=total, unit="city"):
         city = str(r.get("name") or r.get("city") or "").strip()
         country = str(r.get("country") or "").strip()
         try:
@@ -317,29 +580,26 @@ def enrich_records_with_hospital_presence_osm(
         found = False
         nearest_km: Optional[float] = None
         nearest_hospital: Optional[Dict] = None
-        if lat0 is not None and lon0 is not None:
-            # First pass: coarse scan within a small degree window for quick positives
-            for h in hospitals:
-                hlat = float(h.get("latitude"))
-                hlon = float(h.get("longitude"))
-                if abs(hlat - lat0) > deg_radius or abs(hlon - lon0) > deg_radius:
-                    continue
-                d = _haversine_km(lat0, lon0, hlat, hlon)
-                if nearest_km is None or d < nearest_km:
-                    nearest_km = d
-                    nearest_hospital = h
-                if d <= radius_km:
-                    found = True
-                    break
-            # Second pass: if nothing nearby, compute true nearest across all hospitals
-            if nearest_km is None:
-                for h in hospitals:
-                    hlat = float(h.get("latitude"))
-                    hlon = float(h.get("longitude"))
-                    d = _haversine_km(lat0, lon0, hlat, hlon)
-                    if nearest_km is None or d < nearest_km:
-                        nearest_km = d
-                        nearest_hospital = h
+        if lat0 is not None and lon0 is not None and n_hosp:
+            # Coarse window: latitude band via binary search on the sorted
+            # array, then a longitude mask on just that band; widen to all
+            # hospitals when nothing is nearby (true-nearest fallback).
+            lo = int(np.searchsorted(hlat_sorted, lat0 - deg_radius, side="left"))
+            hi = int(np.searchsorted(hlat_sorted, lat0 + deg_radius, side="right"))
+            band = lat_order[lo:hi]
+            idx = band[np.abs(hlon[band] - lon0) <= deg_radius]
+            if idx.size == 0:
+                idx = np.arange(n_hosp)
+            lat0_rad = radians(lat0)
+            dlat = hlat_rad[idx] - lat0_rad
+            dlon = hlon_rad[idx] - radians(lon0)
+            a = np.sin(dlat / 2.0) ** 2 + cos(lat0_rad) * cos_hlat[idx] * np.sin(dlon / 2.0) ** 2
+            d = 2.0 * 6371.0 * np.arcsin(np.sqrt(a))
+            if not np.all(np.isnan(d)):
+                j = int(np.nanargmin(d))
+                nearest_km = float(d[j])
+                nearest_hospital = hospitals[int(idx[j])]
+                found = nearest_km <= radius_km
 
         new_record = dict(r)
         # Primary presence determination
@@ -417,36 +677,57 @@ def enrich_records_with_hospital_presence_osm(
             new_record["hospital_nearest_latitude"] = ""
             new_record["hospital_nearest_longitude"] = ""
 
-        # Driving distance/time via OSRM to nearest hospital when coordinates are available
+        # Driving distance/time via OSRM is resolved in a threaded pass after
+        # the scan; queue the coordinates here and leave the fields blank.
+        new_record["driving_km_to_hospital"] = ""
+        new_record["driving_time_minutes_to_hospital"] = ""
         if (
             isinstance(lat0, (int, float))
             and isinstance(lon0, (int, float))
             and isinstance(new_record.get("hospital_nearest_latitude"), (int, float))
             and isinstance(new_record.get("hospital_nearest_longitude"), (int, float))
         ):
-            drive: DriveResult = _osrm_route(
-                city_lat=float(lat0),
-                city_lon=float(lon0),
-                airport_lat=float(new_record["hospital_nearest_latitude"]),
-                airport_lon=float(new_record["hospital_nearest_longitude"]),
+            osrm_pending.append(
+                (
+                    len(enriched),
+                    float(lat0),
+                    float(lon0),
+                    float(new_record["hospital_nearest_latitude"]),
+                    float(new_record["hospital_nearest_longitude"]),
+                )
+            )
+
+        source_records.append(r)
+        enriched.append(new_record)
+
+    # OSRM route lookups are independent network calls on a pooled keep-alive
+    # session, so fan them out instead of paying one round trip per city.
+    if osrm_pending:
+        def _drive(job: Tuple[int, float, float, float, float]) -> Tuple[int, DriveResult]:
+            i, city_lat, city_lon, hosp_lat, hosp_lon = job
+            return i, _osrm_route(
+                city_lat=city_lat,
+                city_lon=city_lon,
+                airport_lat=hosp_lat,
+                airport_lon=hosp_lon,
                 base_url=osrm_base_url,
                 request_timeout=None,
             )
-            if drive.driving_error:
-                new_record["driving_km_to_hospital"] = ""
-                new_record["driving_time_minutes_to_hospital"] = ""
-            else:
-                new_record["driving_km_to_hospital"] = (
-                    drive.driving_km_to_airport if drive.driving_km_to_airport is not None else ""
-                )
-                new_record["driving_time_minutes_to_hospital"] = (
-                    drive.driving_time_minutes_to_airport if drive.driving_time_minutes_to_airport is not None else ""
-                )
-        else:
-            new_record["driving_km_to_hospital"] = ""
-            new_record["driving_time_minutes_to_hospital"] = ""
 
-        enriched.append(new_record)
+        with ThreadPoolExecutor(max_workers=min(osrm_max_workers, len(osrm_pending))) as executor:
+            futures = [executor.submit(_drive, job) for job in osrm_pending]
+            for fut in tqdm(as_completed(futures), desc="OSRM routes", total=len(futures), unit="route"):
+                i, drive = fut.result()
+                if not drive.driving_error:
+                    enriched[i]["driving_km_to_hospital"] = (
+                        drive.driving_km_to_airport if drive.driving_km_to_airport is not None else ""
+                    )
+                    enriched[i]["driving_time_minutes_to_hospital"] = (
+                        drive.driving_time_minutes_to_airport
+                        if drive.driving_time_minutes_to_airport is not None
+                        else ""
+                    )
 
-    return enriched
+    changed = any(nr != orig for nr, orig in zip(enriched, source_records))
+    return enriched, changed
 
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_connections: int = 8, pool_maxsize: int = 16, retries: int = 3) -> requests.Session:
+    """Build a requests.Session with connection pooling and retry on transient errors.
+
+    Reusing one pooled session across Overpass/OSRM/data downloads keeps
+    sockets alive between calls to the same host, saving a TCP(+TLS)
+    handshake per request.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared module-level session; callers may pass their own via `session=` kwargs.
+SESSION = build_session()
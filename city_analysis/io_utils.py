@@ -6,6 +6,11 @@ from pathlib import Path
 from typing import Dict, Iterable, List
 import os
 
+try:  # Optional: much faster JSON serialization when available
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 def write_csv(path: str | Path, records: Iterable[Dict], *, delimiter: str | None = None) -> None:
     records_list: List[Dict] = list(records)
@@ -67,8 +72,12 @@ def write_geojson(path: str | Path, records: Iterable[Dict]) -> None:
             "geometry": {"type": "Point", "coordinates": [lon, lat]},
             "properties": props,
         })
+    collection = {"type": "FeatureCollection", "features": features}
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(json.dumps({"type": "FeatureCollection", "features": features}, ensure_ascii=False), encoding="utf-8")
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(collection, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        Path(path).write_text(json.dumps(collection, ensure_ascii=False), encoding="utf-8")
 
 
 def write_details_json(path: str | Path, records: Iterable[Dict]) -> None:
@@ -121,7 +130,10 @@ def write_details_json(path: str | Path, records: Iterable[Dict]) -> None:
             "details": details,
         })
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(json.dumps(out, ensure_ascii=False), encoding="utf-8")
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(out, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        Path(path).write_text(json.dumps(out, ensure_ascii=False), encoding="utf-8")
 
 
 def read_csv_records(path: str | Path) -> List[Dict]:
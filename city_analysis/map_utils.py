@@ -123,6 +123,43 @@ def _popup_html(r: Dict) -> str:
     return "".join(parts)
 
 
+def _coerce_int(v: Any) -> int:
+    try:
+        if isinstance(v, str):
+            v = v.replace(",", "").replace(" ", "")
+        return int(float(v))
+    except Exception:
+        return 0
+
+
+def prepare_map_records(records: Iterable[Dict]) -> list[Dict]:
+    """Project records once into the fields both map builders need.
+
+    Both maps walk the same dicts to pull coordinates, population, country
+    and popup content. When generating both maps, compute this projection
+    once and pass it to save_map and save_country_map via `prepared=` so
+    the per-record work is not duplicated.
+    """
+    prepared: list[Dict] = []
+    for r in records:
+        try:
+            lat = float(r["latitude"])  # required
+            lon = float(r["longitude"])  # required
+        except Exception:
+            continue
+        prepared.append(
+            {
+                "lat": lat,
+                "lon": lon,
+                "population": _coerce_int(r.get("population", 0)),
+                "country": str(r.get("country") or "UNK"),
+                "popup_html": _popup_html(r),
+                "record": r,
+            }
+        )
+    return prepared
+
+
 def _marker_color(population_value: Optional[int | float]) -> str:
     try:
         pop = float(population_value) if population_value is not None else 0.0
@@ -140,8 +177,8 @@ def _marker_color(population_value: Optional[int | float]) -> str:
     return "blue"
 
 
-def build_map(records: Iterable[Dict], tiles: str = "OpenStreetMap") -> folium.Map:
-    records_list = list(records)
+def build_map(records: Iterable[Dict], tiles: str = "OpenStreetMap", prepared: Optional[list[Dict]] = None) -> folium.Map:
+    items = prepared if prepared is not None else prepare_map_records(records)
     # Default to Alps center for better initial view
     center = (46.5, 10.0)  # Alps region
     
@@ -161,23 +198,12 @@ def build_map(records: Iterable[Dict], tiles: str = "OpenStreetMap") -> folium.M
     peaks_group = folium.FeatureGroup(name="Peaks (≥1200m over city within 30km)").add_to(fmap)
     seen_peak_keys: set[tuple[float, float, str]] = set()
 
-    for r in records_list:
-        try:
-            lat = float(r["latitude"])  # required
-            lon = float(r["longitude"])  # required
-        except Exception:
-            continue
-        popup = folium.Popup(_popup_html(r), max_width=350)
-        color = _marker_color(r.get("population"))
-        # Attach population as a data attribute for client-side filtering
-        # Ensure it is a plain integer to avoid parsing issues in JS
-        def _coerce_int(v: Any) -> int:
-            try:
-                if isinstance(v, str):
-                    v = v.replace(",", "").replace(" ", "")
-                return int(float(v))
-            except Exception:
-                return 0
+    for item in items:
+        r = item["record"]
+        lat = item["lat"]
+        lon = item["lon"]
+        popup = folium.Popup(item["popup_html"], max_width=350)
+        color = _marker_color(item["population"])
         folium.CircleMarker(
             location=(lat, lon),
             radius=6,
@@ -189,7 +215,8 @@ def build_map(records: Iterable[Dict], tiles: str = "OpenStreetMap") -> folium.M
             tooltip=None,
             # custom attributes passed via options; Leaflet keeps them on layer.options
             **{
-                "population": _coerce_int(r.get("population", 0)),
+                # Plain integer population avoids parsing issues in JS
+                "population": item["population"],
                 # Additional attributes for filtering
                 "driving_time_to_airport_minutes": r.get("driving_time_minutes_to_airport", ""),
                 "driving_time_to_hospital_minutes": r.get("driving_time_minutes_to_hospital", ""),
@@ -237,8 +264,8 @@ def build_map(records: Iterable[Dict], tiles: str = "OpenStreetMap") -> folium.M
     return fmap
 
 
-def save_map(records: Iterable[Dict], out_path: str | Path, tiles: str = "OpenStreetMap") -> Path:
-    fmap = build_map(records, tiles=tiles)
+def save_map(records: Iterable[Dict], out_path: str | Path, tiles: str = "OpenStreetMap", prepared: Optional[list[Dict]] = None) -> Path:
+    fmap = build_map(records, tiles=tiles, prepared=prepared)
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     # Render and post-process to avoid object spread for broader browser support
@@ -296,8 +323,8 @@ def _scaled_radius(pop_value: Optional[float | int], min_pop: float, max_pop: fl
     return min_r + t * (max_r - min_r)
 
 
-def build_country_color_population_sized_map(records: Iterable[Dict], tiles: str = "OpenStreetMap") -> folium.Map:
-    items = list(records)
+def build_country_color_population_sized_map(records: Iterable[Dict], tiles: str = "OpenStreetMap", prepared: Optional[list[Dict]] = None) -> folium.Map:
+    items = prepared if prepared is not None else prepare_map_records(records)
     # Default to Alps center for better initial view
     center = (46.5, 10.0)  # Alps region
     
@@ -314,7 +341,7 @@ def build_country_color_population_sized_map(records: Iterable[Dict], tiles: str
         fmap = folium.Map(location=center, zoom_start=7, tiles=tiles, control_scale=True)
 
     # Prepare color mapping and population scaling
-    countries = [str(r.get("country") or "UNK") for r in items]
+    countries = [item["country"] for item in items]
     color_map = _country_color_map(countries)
     min_pop, max_pop = _population_bounds(items)
 
@@ -325,30 +352,19 @@ def build_country_color_population_sized_map(records: Iterable[Dict], tiles: str
     # Group markers by country with separate clusters for toggling via LayerControl
     from collections import defaultdict
     by_country: Dict[str, list[Dict]] = defaultdict(list)
-    for r in items:
-        key = str(r.get("country") or "UNK")
-        by_country[key].append(r)
+    for item in items:
+        by_country[item["country"]].append(item)
 
-    for country, recs in sorted(by_country.items(), key=lambda kv: kv[0]):
-        group = folium.FeatureGroup(name=f"{country} ({len(recs)})")
+    for country, country_items in sorted(by_country.items(), key=lambda kv: kv[0]):
+        group = folium.FeatureGroup(name=f"{country} ({len(country_items)})")
         cluster = MarkerCluster().add_to(group)
         color = color_map.get(country, "blue")
-        for r in recs:
-            try:
-                lat = float(r["latitude"])  # required
-                lon = float(r["longitude"])  # required
-            except Exception:
-                continue
-            radius = _scaled_radius(r.get("population"), min_pop, max_pop)
-            popup = folium.Popup(_popup_html(r), max_width=350)
-            # Attach population as a data attribute for client-side filtering
-            def _coerce_int(v: Any) -> int:
-                try:
-                    if isinstance(v, str):
-                        v = v.replace(",", "").replace(" ", "")
-                    return int(float(v))
-                except Exception:
-                    return 0
+        for item in country_items:
+            r = item["record"]
+            lat = item["lat"]
+            lon = item["lon"]
+            radius = _scaled_radius(item["population"], min_pop, max_pop)
+            popup = folium.Popup(item["popup_html"], max_width=350)
             folium.CircleMarker(
                 location=(lat, lon),
                 radius=radius,
@@ -359,7 +375,7 @@ def build_country_color_population_sized_map(records: Iterable[Dict], tiles: str
                 popup=popup,
                 tooltip=None,
                 **{
-                    "population": _coerce_int(r.get("population", 0)),
+                    "population": item["population"],
                     "driving_time_to_airport_minutes": r.get("driving_time_minutes_to_airport", ""),
                     "driving_time_to_hospital_minutes": r.get("driving_time_minutes_to_hospital", ""),
                     "hospital_in_city": r.get("hospital_in_city", ""),
@@ -408,8 +424,8 @@ def build_country_color_population_sized_map(records: Iterable[Dict], tiles: str
     return fmap
 
 
-def save_country_map(records: Iterable[Dict], out_path: str | Path, tiles: str = "OpenStreetMap") -> Path:
-    fmap = build_country_color_population_sized_map(records, tiles=tiles)
+def save_country_map(records: Iterable[Dict], out_path: str | Path, tiles: str = "OpenStreetMap", prepared: Optional[list[Dict]] = None) -> Path:
+    fmap = build_country_color_population_sized_map(records, tiles=tiles, prepared=prepared)
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     html = fmap.get_root().render()
@@ -3,9 +3,12 @@ from __future__ import annotations
 import math
 from typing import Dict, Iterable, List
 
-from shapely.geometry import Point, Polygon, MultiPolygon
+import numpy as np
+from shapely.geometry import Polygon, MultiPolygon
+
 from .country_filters import infer_country_by_bbox
 from .country_lookup import infer_country_iso_a2
+from .geometry import contains_points
 
 
 def _normalize_name(name: str) -> str:
@@ -27,13 +30,15 @@ def filter_within_perimeter(
     places: Iterable[Dict],
     perimeter: Polygon | MultiPolygon,
 ) -> List[Dict]:
-    results: List[Dict] = []
-    for p in places:
-        lat = float(p["latitude"])  # type: ignore[index]
-        lon = float(p["longitude"])  # type: ignore[index]
-        if perimeter.contains(Point(lon, lat)):
-            results.append(p)
-    return results
+    places_list = list(places)
+    if not places_list:
+        return []
+    # One vectorized contains_xy call over coordinate arrays instead of a
+    # shapely Point + contains per place.
+    lons = np.fromiter((float(p["longitude"]) for p in places_list), dtype=np.float64, count=len(places_list))
+    lats = np.fromiter((float(p["latitude"]) for p in places_list), dtype=np.float64, count=len(places_list))
+    inside = contains_points(perimeter, lons, lats)
+    return [p for p, keep in zip(places_list, inside.tolist()) if keep]
 
 
 def enforce_min_population(places: Iterable[Dict], min_population: int) -> List[Dict]:
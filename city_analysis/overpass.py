@@ -8,6 +8,8 @@ import requests
 from pathlib import Path
 import json
 
+from .http_utils import SESSION
+
 OVERPASS_ENDPOINTS = [
     "https://overpass-api.de/api/interpreter",
     "https://overpass.kumi.systems/api/interpreter",
@@ -47,9 +49,9 @@ def build_overpass_query(
     return query
 
 
-def _try_overpass(endpoint: str, query: str) -> List[Dict]:
+def _try_overpass(endpoint: str, query: str, session: Optional[requests.Session] = None) -> List[Dict]:
     logging.info(f"Overpass: POST {endpoint}")
-    resp = requests.post(endpoint, data={"data": query}, headers=DEFAULT_HEADERS, timeout=120)
+    resp = (session or SESSION).post(endpoint, data={"data": query}, headers=DEFAULT_HEADERS, timeout=120)
     resp.raise_for_status()
     # Ensure proper UTF-8 encoding
     resp.encoding = 'utf-8'
@@ -107,7 +109,7 @@ def _try_overpass(endpoint: str, query: str) -> List[Dict]:
     return results
 
 
-def fetch_overpass_places(query: str, max_retries_per_endpoint: int = 2) -> List[Dict]:
+def fetch_overpass_places(query: str, max_retries_per_endpoint: int = 2, session: Optional[requests.Session] = None) -> List[Dict]:
     """Execute an Overpass query with endpoint fallback and simple backoff.
 
     Returns list of dicts with keys: name, country (if available), latitude, longitude, population, source
@@ -116,7 +118,7 @@ def fetch_overpass_places(query: str, max_retries_per_endpoint: int = 2) -> List
     for endpoint in OVERPASS_ENDPOINTS:
         for attempt in range(max_retries_per_endpoint):
             try:
-                results = _try_overpass(endpoint, query)
+                results = _try_overpass(endpoint, query, session=session)
                 logging.info(f"Overpass: success on {endpoint} (attempt {attempt+1}) elements={len(results)}")
                 return results
             except Exception as e:
@@ -139,6 +141,7 @@ def fetch_overpass_bbox_tiled(
     cache_dir: Optional[str] = None,
     region_slug: Optional[str] = None,
     resume: bool = False,
+    session: Optional[requests.Session] = None,
 ) -> List[Dict]:
     """Split a bbox into tiles and aggregate Overpass results to avoid huge queries.
 
@@ -187,7 +190,7 @@ def fetch_overpass_bbox_tiled(
                         cached_chunk = None
             q = build_overpass_query(tile_bbox, place_types=place_types, require_population_tag=require_population_tag)
             try:
-                chunk = cached_chunk if cached_chunk is not None else fetch_overpass_places(q)
+                chunk = cached_chunk if cached_chunk is not None else fetch_overpass_places(q, session=session)
                 logging.info(f"Overpass tile {tile_index}: received {len(chunk)} elements")
                 # Write cache if enabled and not from cache
                 if cache_file is not None and cached_chunk is None:
@@ -237,8 +240,8 @@ def build_overpass_hospitals_query(
     return query
 
 
-def _try_overpass_hospitals(endpoint: str, query: str) -> List[Dict]:
-    resp = requests.post(endpoint, data={"data": query}, headers=DEFAULT_HEADERS, timeout=180)
+def _try_overpass_hospitals(endpoint: str, query: str, session: Optional[requests.Session] = None) -> List[Dict]:
+    resp = (session or SESSION).post(endpoint, data={"data": query}, headers=DEFAULT_HEADERS, timeout=180)
     resp.raise_for_status()
     resp.encoding = 'utf-8'
     payload = resp.json()
@@ -270,12 +273,12 @@ def _try_overpass_hospitals(endpoint: str, query: str) -> List[Dict]:
     return results
 
 
-def fetch_overpass_hospitals(query: str, max_retries_per_endpoint: int = 2) -> List[Dict]:
+def fetch_overpass_hospitals(query: str, max_retries_per_endpoint: int = 2, session: Optional[requests.Session] = None) -> List[Dict]:
     last_error: Exception | None = None
     for endpoint in OVERPASS_ENDPOINTS:
         for attempt in range(max_retries_per_endpoint):
             try:
-                return _try_overpass_hospitals(endpoint, query)
+                return _try_overpass_hospitals(endpoint, query, session=session)
             except Exception as e:
                 last_error = e
                 time.sleep(1.5 * (attempt + 1))
@@ -291,6 +294,7 @@ def fetch_overpass_hospitals_bbox_tiled(
     cache_dir: Optional[str] = None,
     region_slug: Optional[str] = None,
     resume: bool = False,
+    session: Optional[requests.Session] = None,
 ) -> List[Dict]:
     """Split a bbox into tiles and aggregate Overpass results for hospitals.
 
@@ -329,7 +333,7 @@ def fetch_overpass_hospitals_bbox_tiled(
                             cached_chunk = json.loads(cache_file.read_text(encoding="utf-8"))
                         except Exception:
                             cached_chunk = None
-                chunk = cached_chunk if cached_chunk is not None else fetch_overpass_hospitals(q)
+                chunk = cached_chunk if cached_chunk is not None else fetch_overpass_hospitals(q, session=session)
                 if cache_file is not None and cached_chunk is None:
                     try:
                         cache_file.write_text(json.dumps(chunk, ensure_ascii=False), encoding="utf-8")
@@ -378,8 +382,8 @@ def build_overpass_peaks_query(
     return query
 
 
-def _try_overpass_peaks(endpoint: str, query: str) -> List[Dict]:
-    resp = requests.post(endpoint, data={"data": query}, headers=DEFAULT_HEADERS, timeout=180)
+def _try_overpass_peaks(endpoint: str, query: str, session: Optional[requests.Session] = None) -> List[Dict]:
+    resp = (session or SESSION).post(endpoint, data={"data": query}, headers=DEFAULT_HEADERS, timeout=180)
     resp.raise_for_status()
     resp.encoding = 'utf-8'
     payload = resp.json()
@@ -425,12 +429,12 @@ def _try_overpass_peaks(endpoint: str, query: str) -> List[Dict]:
     return results
 
 
-def fetch_overpass_peaks(query: str, max_retries_per_endpoint: int = 2) -> List[Dict]:
+def fetch_overpass_peaks(query: str, max_retries_per_endpoint: int = 2, session: Optional[requests.Session] = None) -> List[Dict]:
     last_error: Exception | None = None
     for endpoint in OVERPASS_ENDPOINTS:
         for attempt in range(max_retries_per_endpoint):
             try:
-                return _try_overpass_peaks(endpoint, query)
+                return _try_overpass_peaks(endpoint, query, session=session)
             except Exception as e:
                 last_error = e
                 time.sleep(1.5 * (attempt + 1))
@@ -446,6 +450,7 @@ def fetch_overpass_peaks_bbox_tiled(
     cache_dir: Optional[str] = None,
     region_slug: Optional[str] = None,
     resume: bool = False,
+    session: Optional[requests.Session] = None,
 ) -> List[Dict]:
     """Split a bbox into tiles and aggregate Overpass results for peaks.
 
@@ -484,7 +489,7 @@ def fetch_overpass_peaks_bbox_tiled(
                             cached_chunk = json.loads(cache_file.read_text(encoding="utf-8"))
                         except Exception:
                             cached_chunk = None
-                chunk = cached_chunk if cached_chunk is not None else fetch_overpass_peaks(q)
+                chunk = cached_chunk if cached_chunk is not None else fetch_overpass_peaks(q, session=session)
                 if cache_file is not None and cached_chunk is None:
                     try:
                         cache_file.write_text(json.dumps(chunk, ensure_ascii=False), encoding="utf-8")
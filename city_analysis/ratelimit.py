@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token-bucket limiter enforcing an average request rate.
+
+    Unlike a fixed sleep after every call, ``acquire`` only blocks for the
+    part of the interval not already spent doing useful work, so slow
+    requests are not padded with extra idle time. A small ``burst`` allows
+    back-to-back calls after a quiet period.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate = float(rate_per_second)
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestTokenLimiter:
+    """Dual bucket tracking requests-per-minute and tokens-per-minute.
+
+    Mirrors the capacity-refill scheme from OpenAI's parallel-processor
+    recipe: both budgets refill continuously with elapsed time, and a call
+    blocks until it can debit one request plus its estimated token cost.
+    Pass float("inf") for a budget that should not constrain anything.
+    """
+
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        self.max_rpm = float(max_requests_per_minute)
+        self.max_tpm = float(max_tokens_per_minute)
+        self._requests = self.max_rpm
+        self._tokens = self.max_tpm
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until one request plus ``tokens`` tokens fit in the budgets."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last
+                self._last = now
+                self._requests = min(self.max_rpm, self._requests + elapsed * (self.max_rpm / 60.0))
+                self._tokens = min(self.max_tpm, self._tokens + elapsed * (self.max_tpm / 60.0))
+                if self._requests >= 1.0 and self._tokens >= tokens:
+                    self._requests -= 1.0
+                    self._tokens -= tokens
+                    return
+                wait_r = (1.0 - self._requests) / (self.max_rpm / 60.0) if self._requests < 1.0 else 0.0
+                wait_t = (tokens - self._tokens) / (self.max_tpm / 60.0) if self._tokens < tokens else 0.0
+                wait = max(wait_r, wait_t, 0.001)
+            time.sleep(wait)